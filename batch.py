@@ -0,0 +1,65 @@
+import argparse
+import datetime
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from export import WORKBOOKS, create_combined_excel_file
+from ingest import date_bounds, load_remarks, select_date_range
+from metrics import aggregate_hourly, build_report_tables, hourly_collector_table
+
+
+# Build the per-client and per-collector workbooks of one Daily Remark file into output_dir.
+# The date range defaults to every day in the file. Returns the paths written.
+def generate_reports(input_path, output_dir, start_date=None, end_date=None):
+    with open(input_path, 'rb') as f:
+        _, df = load_remarks(f.read())
+    first_day, last_day = date_bounds(df)
+    start_date = start_date or first_day
+    end_date = end_date or last_day
+    filtered_df = select_date_range(df, start_date, end_date)
+    overall_client_summary_df, overall_collector_summary_df, _, _ = build_report_tables(filtered_df, start_date, end_date)
+
+    # Same workbooks as the app's download buttons
+    overall_summaries = {'client': overall_client_summary_df, 'collector': overall_collector_summary_df}
+    hourly_dfs = {'client': None, 'collector': hourly_collector_table(aggregate_hourly(filtered_df))}
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for report_type, (sheet_prefix, main_header_text, file_name) in WORKBOOKS.items():
+        path = os.path.join(output_dir, f"{stem}_{file_name}")
+        with open(path, 'wb') as f:
+            f.write(create_combined_excel_file(
+                {}, overall_summaries[report_type], sheet_prefix, main_header_text, hourly_dfs[report_type]
+            ))
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the MC06 monitoring workbooks for Daily Remark files without Streamlit.")
+    parser.add_argument('inputs', nargs='+', help="Daily Remark .xlsx files")
+    parser.add_argument('-o', '--output-dir', required=True, help="directory for the generated workbooks")
+    parser.add_argument('--start', type=datetime.date.fromisoformat, help="first day to report (YYYY-MM-DD), default: first day in each file")
+    parser.add_argument('--end', type=datetime.date.fromisoformat, help="last day to report (YYYY-MM-DD), default: last day in each file")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="number of files processed in parallel")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(generate_reports, input_path, args.output_dir, args.start, args.end): input_path
+            for input_path in args.inputs
+        }
+        for future in as_completed(futures):
+            try:
+                for path in future.result():
+                    print(path)
+            except Exception as e:
+                failed += 1
+                print(f"{futures[future]}: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
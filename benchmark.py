@@ -0,0 +1,153 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from export import WORKBOOKS, create_combined_excel_file
+from ingest import classify_remarks, clean_remarks, compact_remarks, date_bounds, read_remarks, select_date_range
+from metrics import (
+    aggregate_hourly, aggregate_remarks, client_daily_tables, collector_daily_tables, format_date_range,
+    hourly_collector_table, overall_client_summary, overall_collector_summary
+)
+from synthetic import XLSX_MAX_ROWS, generate_remarks, write_remarks_xlsx
+
+DEFAULT_ROWS = [10000, 100000, 1000000]
+
+
+# Run the app's pipeline once on a generated frame, calling measure(stage, func) for every stage.
+# Workbook ingestion is only measured when the rows fit in one xlsx sheet.
+def _run_stages(raw_df, xlsx_path, measure):
+    if xlsx_path is not None:
+        measure('ingest', lambda: read_remarks(xlsx_path))
+    df = measure('clean', lambda: classify_remarks(compact_remarks(clean_remarks(raw_df).drop(columns=['Remark']))))
+
+    start_date, end_date = date_bounds(df)
+    filtered_df = measure('filter', lambda: select_date_range(df, start_date, end_date))
+    day_aggregates, outgoing_accounts = measure('aggregate', lambda: aggregate_remarks(filtered_df))
+
+    date_range_str = format_date_range(start_date, end_date)
+    overall = {
+        'client': measure('client_summary', lambda: overall_client_summary(day_aggregates, outgoing_accounts, date_range_str)),
+        'collector': measure('collector_summary', lambda: overall_collector_summary(day_aggregates, outgoing_accounts, date_range_str)),
+    }
+    daily = {
+        'client': measure('client_daily_tables', lambda: client_daily_tables(day_aggregates, outgoing_accounts)),
+        'collector': measure('collector_daily_tables', lambda: collector_daily_tables(day_aggregates, outgoing_accounts)),
+    }
+    hourly = {
+        'client': None,
+        'collector': measure('hourly', lambda: hourly_collector_table(aggregate_hourly(filtered_df))),
+    }
+
+    # Exports include every per-day sheet, the largest workbook create_combined_excel_file can be asked for
+    for report_type, (sheet_prefix, main_header_text, _) in WORKBOOKS.items():
+        measure(
+            f'{report_type}_export',
+            lambda: create_combined_excel_file(
+                daily[report_type], overall[report_type], sheet_prefix, main_header_text, hourly[report_type]
+            )
+        )
+    return len(df), len(day_aggregates)
+
+
+# Wall time of every stage, measured without tracing so tracemalloc's overhead stays out of the timings
+def _time_stages(raw_df, xlsx_path):
+    stages = {}
+
+    def measure(stage, func):
+        start = time.perf_counter()
+        result = func()
+        stages[stage] = {'wall_s': round(time.perf_counter() - start, 4)}
+        return result
+
+    rows, groups = _run_stages(raw_df, xlsx_path, measure)
+    return stages, rows, groups
+
+
+# Peak traced memory of every stage, in MB above what was allocated when the stage started
+def _trace_stages(raw_df, xlsx_path):
+    peaks = {}
+
+    def measure(stage, func):
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            result = func()
+            peaks[stage] = round((tracemalloc.get_traced_memory()[1] - baseline) / 2 ** 20, 1)
+        finally:
+            tracemalloc.stop()
+        return result
+
+    _run_stages(raw_df, xlsx_path, measure)
+    return peaks
+
+
+# Benchmark one synthetic dataset size
+def run_benchmark(rows, clients, collectors, days, seed=0, memory=True, work_dir=None):
+    raw_df = generate_remarks(rows, clients, collectors, days, seed=seed)
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        xlsx_path = None
+        if rows <= XLSX_MAX_ROWS:
+            xlsx_path = os.path.join(tmp_dir, 'daily_remark.xlsx')
+            write_remarks_xlsx(raw_df, xlsx_path)
+        stages, clean_rows, groups = _time_stages(raw_df, xlsx_path)
+        if memory:
+            for stage, peak_mb in _trace_stages(raw_df, xlsx_path).items():
+                stages[stage]['peak_mb'] = peak_mb
+    return {
+        'rows': rows,
+        'clients': clients,
+        'collectors': collectors,
+        'days': days,
+        'seed': seed,
+        'clean_rows': clean_rows,
+        'groups': groups,
+        'stages': stages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the MC06 report pipeline on synthetic Daily Remark data.")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="dataset sizes to benchmark")
+    parser.add_argument('--clients', type=int, default=10, help="number of clients")
+    parser.add_argument('--collectors', type=int, default=100, help="number of collectors")
+    parser.add_argument('--days', type=int, default=22, help="number of remark days")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help="skip the traced pass that measures peak memory")
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    results = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'runs': [],
+    }
+    for rows in args.rows:
+        run = run_benchmark(rows, args.clients, args.collectors, args.days, args.seed, args.memory)
+        results['runs'].append(run)
+        for stage, measures in run['stages'].items():
+            peak = f"  {measures['peak_mb']:>8.1f} MB" if 'peak_mb' in measures else ""
+            print(f"{rows:>9} rows  {stage:<24}{measures['wall_s']:>9.3f} s{peak}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
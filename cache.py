@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+from cachetools import LRUCache
+
+# Bump when the cleaned frame layout changes so stale cache entries are ignored
+CACHE_VERSION = 5
+
+# On-disk cache location and size budget; a budget of 0 disables the cache
+CACHE_DIR = os.environ.get('MC06_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mc06_cache'))
+CACHE_MAX_BYTES = int(float(os.environ.get('MC06_CACHE_MAX_MB', '2048')) * 1024 * 1024)
+
+# Memory budget of the in-process report table cache
+RESULT_CACHE_MAX_BYTES = int(float(os.environ.get('MC06_RESULT_CACHE_MB', '512')) * 1024 * 1024)
+
+
+# Content hash of an uploaded file, used as the dataset key
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _frame_path(key):
+    return os.path.join(CACHE_DIR, f"v{CACHE_VERSION}-{key}.parquet")
+
+
+# Return the cleaned frame cached for this key, or None on a miss
+def load_cached_frame(key):
+    if CACHE_MAX_BYTES <= 0:
+        return None
+    path = _frame_path(key)
+    try:
+        df = pd.read_parquet(path)
+        # Touch the entry so eviction drops the least recently used files first
+        os.utime(path)
+    except (OSError, pa.ArrowException):
+        return None
+    return df
+
+
+# Store a cleaned frame as Parquet, then evict old entries beyond the size budget
+def store_cached_frame(key, df):
+    if CACHE_MAX_BYTES <= 0:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _frame_path(key)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException):
+        # Frames Arrow cannot represent (e.g. mixed-type object columns) are simply not cached
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    evict_cached_frames(keep=path)
+
+
+# Delete least recently used entries until the cache fits in CACHE_MAX_BYTES
+def evict_cached_frames(keep=None):
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if not name.endswith('.parquet'):
+            continue
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+# Approximate memory held by a report table or a set of report tables (DataFrames and dicts of DataFrames)
+def _tables_size(tables):
+    if isinstance(tables, pd.DataFrame):
+        tables = [tables]
+    size = 0
+    for table in tables:
+        frames = table.values() if isinstance(table, dict) else [table]
+        size += sum(int(frame.memory_usage(index=True, deep=True).sum()) for frame in frames)
+    return size
+
+
+_report_cache = LRUCache(maxsize=RESULT_CACHE_MAX_BYTES, getsizeof=_tables_size)
+_report_cache_lock = threading.Lock()
+
+
+# Return the report tables cached under key, computing and caching them on a miss.
+# The cache is shared by every session of this process and evicts least recently used entries past its budget.
+def cached_report_tables(key, compute):
+    with _report_cache_lock:
+        tables = _report_cache.get(key)
+    if tables is None:
+        tables = compute()
+        with _report_cache_lock:
+            try:
+                _report_cache[key] = tables
+            except ValueError:
+                # Larger than the whole budget; serve it uncached
+                pass
+    return tables
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from profiling import stage
+
+# JSON file with the skip status lists; edits are picked up on the next run without a restart
+TAXONOMY_PATH = os.environ.get('MC06_SKIP_TAXONOMY', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skip_taxonomy.json'))
+# Positive skips are case-insensitive keyword matches, negative and RPC skips exact status matches
+TAXONOMY_LISTS = ['positive_skip_keywords', 'negative_skip_status', 'rpc_skip_status']
+
+# Characters that make a positive keyword a regular expression rather than plain text
+REGEX_CHARACTERS = set('.^$*+?{}[]\\|()')
+
+# Skip category codes, stored per row as an int8 bit mask so a status can carry more than one kind
+NO_SKIP = 0
+POSITIVE_SKIP = 1
+NEGATIVE_SKIP = 2
+RPC_SKIP = 4
+
+
+# Read a skip taxonomy file: every list in TAXONOMY_LISTS, with repeated entries dropped (first one kept).
+# A positive keyword that is not a valid regular expression is a ValueError, like any other broken entry.
+def load_taxonomy(path=TAXONOMY_PATH):
+    with open(path) as f:
+        data = json.load(f)
+    missing = [name for name in TAXONOMY_LISTS if name not in data]
+    if missing:
+        raise ValueError(f"Skip taxonomy {path} is missing {', '.join(missing)}")
+    for name in TAXONOMY_LISTS:
+        if not all(isinstance(value, str) for value in data[name]):
+            raise ValueError(f"Skip taxonomy {path}: {name} must be a list of strings")
+    for keyword in data['positive_skip_keywords']:
+        try:
+            re.compile(keyword)
+        except re.error as e:
+            raise ValueError(f"Skip taxonomy {path}: invalid positive keyword {keyword!r}: {e}") from e
+    return {name: list(dict.fromkeys(data[name])) for name in TAXONOMY_LISTS}
+
+
+# Aho-Corasick automaton over lowercased keywords: goto transitions, failure links and whether a keyword
+# ends at each state (directly or through a failure link)
+def _build_automaton(keywords):
+    goto = [{}]
+    fail = [0]
+    ends = [False]
+    for keyword in keywords:
+        state = 0
+        for char in keyword.lower():
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                fail.append(0)
+                ends.append(False)
+            state = goto[state][char]
+        ends[state] = True
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for char, child in goto[state].items():
+            queue.append(child)
+            link = fail[state]
+            while link and char not in goto[link]:
+                link = fail[link]
+            fail[child] = goto[link].get(char, 0)
+            ends[child] = ends[child] or ends[fail[child]]
+    return goto, fail, ends
+
+
+# Whether any keyword of the automaton occurs in a lowercased text, in one pass over it
+def _contains_keyword(automaton, text):
+    goto, fail, ends = automaton
+    if ends[0]:
+        return True
+    state = 0
+    for char in text:
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        if ends[state]:
+            return True
+    return False
+
+
+# Case-insensitive alternation of keywords, or None without any
+def _compile_alternation(keywords):
+    if not keywords:
+        return None
+    try:
+        return re.compile('|'.join(keywords), flags=re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Skip taxonomy: positive keywords do not combine into one pattern: {e}") from e
+
+
+# Compile a skip taxonomy once. Positive keywords are matched as the original case-insensitive regex
+# alternation: plain ASCII keywords through one Aho-Corasick automaton, keywords with regex characters
+# (e.g. "(SMS & EMAIL)" is a group, not literal parentheses) through a regex of their own, and statuses
+# with non-ASCII text, where lowercasing and IGNORECASE can disagree, through the whole alternation.
+# Negative and RPC statuses are hash sets. The version fingerprints the lists for cache keys.
+def compile_taxonomy(taxonomy):
+    positive_keywords = taxonomy['positive_skip_keywords']
+    plain_keywords = [keyword for keyword in positive_keywords if keyword.isascii() and not REGEX_CHARACTERS & set(keyword)]
+    regex_keywords = [keyword for keyword in positive_keywords if keyword not in plain_keywords]
+    return {
+        **taxonomy,
+        'version': hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode()).hexdigest(),
+        'positive_automaton': _build_automaton(plain_keywords),
+        'positive_regex': _compile_alternation(regex_keywords),
+        'positive_pattern': _compile_alternation(positive_keywords),
+        'negative_set': frozenset(taxonomy['negative_skip_status']),
+        'rpc_set': frozenset(taxonomy['rpc_skip_status']),
+    }
+
+
+_compiled_taxonomies = {}
+_compiled_taxonomies_lock = threading.Lock()
+
+
+# The compiled taxonomy of a file, recompiled only when the file changes
+def skip_taxonomy(path=None):
+    path = path or TAXONOMY_PATH
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _compiled_taxonomies_lock:
+        entry = _compiled_taxonomies.get(path)
+        if entry is None or entry[0] != stamp:
+            entry = (stamp, compile_taxonomy(load_taxonomy(path)))
+            _compiled_taxonomies[path] = entry
+        return entry[1]
+
+
+# The skip lists as loaded at start-up, the defaults of the reference loops and the synthetic data
+positive_skip_keywords = skip_taxonomy()['positive_skip_keywords']
+negative_skip_status = skip_taxonomy()['negative_skip_status']
+rpc_skip_status = skip_taxonomy()['rpc_skip_status']
+
+
+def _is_positive(taxonomy, text):
+    if not text.isascii():
+        return taxonomy['positive_pattern'] is not None and taxonomy['positive_pattern'].search(text) is not None
+    if _contains_keyword(taxonomy['positive_automaton'], text.lower()):
+        return True
+    return taxonomy['positive_regex'] is not None and taxonomy['positive_regex'].search(text) is not None
+
+
+# Classify each distinct status once with a compiled taxonomy (the current skip_taxonomy() by default)
+def classify_status_values(values, taxonomy=None):
+    taxonomy = taxonomy or skip_taxonomy()
+    negative_set = taxonomy['negative_set']
+    rpc_set = taxonomy['rpc_set']
+    categories = np.zeros(len(values), dtype=np.int8)
+    for idx, value in enumerate(values):
+        if _is_positive(taxonomy, str(value)):
+            categories[idx] |= POSITIVE_SKIP
+        if value in negative_set:
+            categories[idx] |= NEGATIVE_SKIP
+        if value in rpc_set:
+            categories[idx] |= RPC_SKIP
+    return categories
+
+
+# Map a Status column to skip category codes; the cost scales with the number of distinct statuses
+def classify_statuses(status, taxonomy=None):
+    with stage('classify', rows=len(status)) as counts:
+        codes, uniques = pd.factorize(status)
+        counts['groups'] = len(uniques)
+        categories = classify_status_values(uniques, taxonomy)
+    # Missing statuses (code -1) pick up the trailing NO_SKIP entry
+    categories = np.append(categories, np.int8(NO_SKIP))
+    return pd.Series(categories[codes], index=status.index, name='Skip Category')
@@ -0,0 +1,176 @@
+import argparse
+import datetime
+import sys
+import warnings
+
+import pandas as pd
+
+from classifier import TAXONOMY_LISTS, skip_taxonomy
+from ingest import classify_remarks, clean_remarks, compact_remarks, read_remarks, select_date_range
+from metrics import build_report_tables, format_durations
+from reference import reference_clean_remarks, reference_load_remarks, reference_report_tables, reference_select_date_range
+from synthetic import generate_remarks
+
+TABLE_NAMES = ['overall client summary', 'overall collector summary', 'client daily tables', 'collector daily tables']
+
+
+# Cells are equal when their values compare equal or both are missing (None and NaN alike)
+def _same_cell(expected, actual):
+    return expected == actual or (pd.isna(expected) and pd.isna(actual))
+
+
+# Every cell-level difference between a reference table and the table under test
+def compare_frames(expected, actual, name):
+    if list(expected.columns) != list(actual.columns):
+        return [f"{name}: columns {list(expected.columns)} != {list(actual.columns)}"]
+    if len(expected) != len(actual):
+        return [f"{name}: {len(expected)} rows != {len(actual)} rows"]
+    differences = []
+    for column in expected.columns:
+        for row_idx, (u, v) in enumerate(zip(expected[column].tolist(), actual[column].tolist())):
+            if not _same_cell(u, v):
+                differences.append(f"{name}: row {row_idx}, {column!r}: {u!r} != {v!r}")
+    return differences
+
+
+# The report tables as displayed: talk times kept in seconds are shown as HH:MM:SS, like the reference strings
+def display_tables(tables):
+    return [
+        {key: format_durations(table) for key, table in tables.items()} if isinstance(tables, dict) else format_durations(tables)
+        for tables in tables
+    ]
+
+
+# Every difference between two sets of the four report tables, per-day tables matched by their key.
+# The tables under test are compared as displayed.
+def compare_report_tables(expected, actual):
+    actual = display_tables(actual)
+    differences = []
+    for table_name, expected_table, actual_table in zip(TABLE_NAMES, expected, actual):
+        if isinstance(expected_table, dict):
+            if list(expected_table) != list(actual_table):
+                missing = [key for key in expected_table if key not in actual_table]
+                extra = [key for key in actual_table if key not in expected_table]
+                differences.append(f"{table_name}: keys differ, missing {missing[:10]}, extra {extra[:10]}")
+            for key in expected_table:
+                if key in actual_table:
+                    differences += compare_frames(expected_table[key], actual_table[key], f"{table_name} [{key}]")
+        else:
+            differences += compare_frames(expected_table, actual_table, table_name)
+    return differences
+
+
+def _date_bounds(df, start_date, end_date):
+    return start_date or df['Date'].min().date(), end_date or df['Date'].max().date()
+
+
+# The reference loops warn on every group (match groups in the positive skip regex, chained assignment);
+# the warnings are part of the frozen behaviour and only drown the report. Both sides use the same skip lists.
+def _reference_tables(reference_df, start_date, end_date, taxonomy):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return reference_report_tables(
+            reference_select_date_range(reference_df, start_date, end_date), start_date, end_date,
+            *[taxonomy[name] for name in TAXONOMY_LISTS]
+        )
+
+
+# Compare the reference loops with the fast path on a raw Daily Remark frame
+def check_frame(raw_df, start_date=None, end_date=None):
+    reference_df = reference_clean_remarks(raw_df)
+    start_date, end_date = _date_bounds(reference_df, start_date, end_date)
+    taxonomy = skip_taxonomy()
+    expected = _reference_tables(reference_df, start_date, end_date, taxonomy)
+    df = classify_remarks(compact_remarks(clean_remarks(raw_df).drop(columns=['Remark'])), taxonomy)
+    actual = build_report_tables(select_date_range(df, start_date, end_date), start_date, end_date)
+    return compare_report_tables(expected, actual)
+
+
+# Compare the reference loops with the fast path on a Daily Remark workbook, each reading it its own way
+def check_file(path, start_date=None, end_date=None):
+    reference_df = reference_load_remarks(path)
+    start_date, end_date = _date_bounds(reference_df, start_date, end_date)
+    taxonomy = skip_taxonomy()
+    expected = _reference_tables(reference_df, start_date, end_date, taxonomy)
+    df = classify_remarks(read_remarks(path), taxonomy)
+    actual = build_report_tables(select_date_range(df, start_date, end_date), start_date, end_date)
+    return compare_report_tables(expected, actual)
+
+
+# One raw remark row; every field not given is blank
+def _remark(client, collector, date, status='PTP', call_status='CONNECTED', account=1000000000, duration=60.0, talk_time=None):
+    return {
+        'Client': client, 'Remark By': collector, 'Date': pd.Timestamp(date), 'Time': '09:00:00', 'Status': status,
+        'Call Status': call_status, 'Remark Type': 'Outgoing', 'Account No.': account,
+        'Talk Time Duration': duration if talk_time is None else talk_time, 'Call Duration': duration, 'Remark': '',
+    }
+
+
+# Small fixed frames for the rounding and blank-value quirks random data rarely hits
+def edge_case_frames():
+    positive = skip_taxonomy()['positive_skip_keywords'][0]
+    negative = skip_taxonomy()['negative_skip_status'][0]
+    return {
+        # 1/40 rounds to 0.03 with the reference loops' round() but to 0.02 with numpy's Series.round(2)
+        'one skip among 40 collectors': pd.DataFrame([
+            _remark('CLIENT 1', f'AGENT {idx:02d}', '2025-01-01', positive if idx == 0 else 'PTP', account=1000 + idx)
+            for idx in range(40)
+        ]),
+        # A day whose rows carry a date and nothing else
+        'whole-day blanks': pd.DataFrame(
+            [_remark('CLIENT 1', 'AGENT 01', '2025-01-01', negative), _remark('CLIENT 1', 'AGENT 02', '2025-01-01')]
+            + [_remark(None, None, '2025-01-02', None, None, None, None) for _ in range(3)]
+            + [_remark('CLIENT 1', 'AGENT 01', '2025-01-03', positive, 'NO ANSWER')]
+        ),
+        # On its second day CLIENT 2's valid calls all have a blank Remark By, so it has no collectors that day and
+        # its daily skip ratios are infinite. Its talk time that day is zero: with any talk time, or with no named
+        # collector on any day, the reference loops fail on int() of an infinite or missing average.
+        'client without named collectors on a day': pd.DataFrame(
+            [_remark('CLIENT 1', 'AGENT 01', '2025-01-01', positive), _remark('CLIENT 1', 'AGENT 02', '2025-01-02')]
+            + [_remark('CLIENT 2', 'AGENT 03', '2025-01-01', negative)]
+            + [_remark('CLIENT 2', None, '2025-01-02', status, talk_time=0.0) for status in [positive, negative, 'PTP']]
+        ),
+    }
+
+
+def _report(label, differences, limit):
+    print(f"{label}: {'OK' if not differences else f'{len(differences)} differences'}")
+    for difference in differences[:limit]:
+        print(f"  {difference}")
+    return not differences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the optimized MC06 report tables cell by cell against the original loops.")
+    parser.add_argument('inputs', nargs='*', help="Daily Remark .xlsx files to check")
+    parser.add_argument('--seeds', type=int, nargs='*', default=[0, 1, 2], help="seeds of the generated datasets to check")
+    parser.add_argument('--rows', type=int, default=20000, help="rows per generated dataset")
+    parser.add_argument('--clients', type=int, default=5, help="clients per generated dataset")
+    parser.add_argument('--collectors', type=int, default=40, help="collectors per generated dataset")
+    parser.add_argument('--days', type=int, default=7, help="days per generated dataset")
+    parser.add_argument('--missing-rate', type=float, default=0.01, help="share of blank key, status and account cells in generated datasets")
+    parser.add_argument('--start', type=datetime.date.fromisoformat, help="first day to report (YYYY-MM-DD), default: first day in the data")
+    parser.add_argument('--end', type=datetime.date.fromisoformat, help="last day to report (YYYY-MM-DD), default: last day in the data")
+    parser.add_argument('--show', type=int, default=20, help="differences printed per dataset")
+    args = parser.parse_args(argv)
+
+    ok = True
+    for label, raw_df in edge_case_frames().items():
+        ok &= _report(f"edge case: {label}", check_frame(raw_df), args.show)
+    for seed in args.seeds:
+        raw_df = generate_remarks(args.rows, args.clients, args.collectors, args.days, seed=seed, missing_rate=args.missing_rate)
+        ok &= _report(f"generated seed {seed}", check_frame(raw_df, args.start, args.end), args.show)
+        # A range that starts after the first day also exercises the date filter
+        first_day = raw_df['Date'].min().date()
+        ok &= _report(
+            f"generated seed {seed}, from day 2",
+            check_frame(raw_df, args.start or first_day + datetime.timedelta(days=1), args.end),
+            args.show
+        )
+    for path in args.inputs:
+        ok &= _report(path, check_file(path, args.start, args.end), args.show)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+from io import BytesIO
+
+import xlsxwriter
+
+from metrics import DURATION_COLUMNS, format_durations
+from profiling import stage
+
+# Sheet prefix, title text and file name of each report workbook
+WORKBOOKS = {
+    'client': ("Summary", "Daily Summary for", "MC06_Monitoring_Per_Client_Results.xlsx"),
+    'collector': ("Collector_Summary", "Daily Summary for Collector", "MC06_Monitoring_Per_Collector_Results.xlsx"),
+}
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+SECONDS_PER_DAY = 86400
+
+
+# Auto-fit width of each column: its longest value or header, plus padding
+def _column_widths(columns, rows):
+    widths = [len(str(col)) for col in columns]
+    for col_idx, values in enumerate(zip(*rows)):
+        widths[col_idx] = max(widths[col_idx], max(map(len, map(str, values))))
+    return [width + 2 for width in widths]
+
+
+# Write one sheet in row order: navy title, red header row, then the data rows.
+# Cell formats come from the column defaults, so every row is written in a single write_row call.
+# Talk times are written as native Excel durations (fractions of a day) and sized by their HH:MM:SS text.
+def _write_sheet(workbook, sheet_name, df, title, title_range, first_column_format, formats):
+    worksheet = workbook.add_worksheet(sheet_name)
+    time_columns = [col_idx for col_idx, column in enumerate(df.columns) if column in DURATION_COLUMNS]
+    values = df.copy()
+    for col_idx in time_columns:
+        values.isetitem(col_idx, df.iloc[:, col_idx] / SECONDS_PER_DAY)
+    rows = values.astype(object).to_numpy().tolist()
+    display_rows = format_durations(df).astype(object).to_numpy().tolist()
+    for col_idx, width in enumerate(_column_widths(df.columns, display_rows)):
+        if col_idx == 0:  # 'Day' or 'Date Range' column
+            column_format = first_column_format
+        elif col_idx in time_columns:
+            column_format = formats['time']
+        else:
+            column_format = formats['cell']
+        worksheet.set_column(col_idx, col_idx, width, column_format)
+    worksheet.merge_range(title_range, title, formats['main_header'])
+    worksheet.write_row(1, 0, list(df.columns), formats['header'])
+    for row_idx, row in enumerate(rows):
+        # Missing values are left blank, as to_excel does
+        worksheet.write_row(row_idx + 2, 0, [None if value != value else value for value in row])
+
+
+# Function to create a single Excel file with multiple sheets, auto-fit columns, borders, middle alignment, red headers, and custom date formats.
+# An hourly collector table, when given, is added as an extra Hourly sheet after the overall one.
+def create_combined_excel_file(summary_dfs, overall_summary_df, sheet_prefix, main_header_text, hourly_df=None):
+    rows = len(overall_summary_df) + sum(len(summary_df) for summary_df in summary_dfs.values())
+    if hourly_df is not None:
+        rows += len(hourly_df)
+    with stage(f"export {sheet_prefix}", rows=rows, groups=len(summary_dfs) + 1 + (hourly_df is not None)):
+        return _create_combined_excel_file(summary_dfs, overall_summary_df, sheet_prefix, main_header_text, hourly_df)
+
+
+def _create_combined_excel_file(summary_dfs, overall_summary_df, sheet_prefix, main_header_text, hourly_df):
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    main_header_format = workbook.add_format({
+        'bg_color': '#000080',  # Navy blue background
+        'font_color': '#FFFFFF',  # White text
+        'bold': True,
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter',
+        'font_size': 14
+    })
+    header_format = workbook.add_format({
+        'bg_color': '#FF0000',  # Red background
+        'font_color': '#FFFFFF',  # White text
+        'bold': True,
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    })
+    cell_format = workbook.add_format({
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    })
+    date_format = workbook.add_format({
+        'num_format': 'dd/mm/yyyy',  # Changed to DD/MM/YYYY
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    })
+    date_range_format = workbook.add_format({
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    })
+    time_format = workbook.add_format({
+        'num_format': '[hh]:mm:ss',  # e.g., 01:23:45, hours past 24 included
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    })
+
+    formats = {
+        'main_header': main_header_format,
+        'header': header_format,
+        'cell': cell_format,
+        'time': time_format,
+    }
+
+    # Process each summary sheet
+    for key, summary_df in summary_dfs.items():
+        _write_sheet(
+            workbook, f"{sheet_prefix}_{key[:31]}", summary_df, f"{main_header_text} {key}", 'A1:V1',
+            date_format if sheet_prefix == "Summary" else date_range_format, formats
+        )
+
+    # Process the overall summary sheet
+    _write_sheet(
+        workbook, f"Overall_{sheet_prefix}", overall_summary_df, f"Overall {main_header_text}", 'A1:W1',
+        date_range_format, formats
+    )
+
+    # Process the hourly sheet
+    if hourly_df is not None:
+        _write_sheet(
+            workbook, f"Hourly_{sheet_prefix}", hourly_df, f"Hourly {main_header_text}", 'A1:H1',
+            date_range_format, formats
+        )
+
+    workbook.close()
+    return output.getvalue()
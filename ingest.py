@@ -0,0 +1,217 @@
+import datetime
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from pandas.api.types import union_categoricals
+from pandas.io.parsers import TextParser
+
+from cache import content_hash, load_cached_frame, store_cached_frame
+from classifier import classify_statuses
+from profiling import stage
+
+# Columns the reports read from a Daily Remark sheet; every other column is skipped while reading
+REQUIRED_COLUMNS = [
+    'Client', 'Remark By', 'Date', 'Time', 'Status', 'Call Status', 'Remark Type', 'Account No.',
+    'Talk Time Duration', 'Call Duration', 'Remark'
+]
+CATEGORICAL_COLUMNS = ['Client', 'Remark By', 'Status', 'Call Status', 'Remark Type']
+DURATION_COLUMNS = ['Talk Time Duration', 'Call Duration']
+CHUNK_ROWS = 10000
+
+# Remark days are stored as int32 day numbers counted from 1970-01-01; rows without a date get
+# MISSING_DAY, which sorts after every real day
+EPOCH = datetime.date(1970, 1, 1)
+MISSING_DAY = np.iinfo(np.int32).max
+# Time is stored as int32 seconds after midnight, MISSING_TIME when it is blank or unreadable
+MISSING_TIME = -1
+
+
+# Clean a raw Daily Remark frame: drop broken promises and coerce column types
+def clean_remarks(df):
+    with stage('coerce', rows=len(df)):
+        return _clean_remarks(df)
+
+
+def _clean_remarks(df):
+    # Filter out rows where 'Remark' contains "broken promise" (case-insensitive)
+    df = df[~df['Remark'].astype(str).str.contains("broken promise", case=False, na=False)].copy()
+
+    # Store 'Time' as seconds after midnight
+    df['Time'] = time_seconds(df['Time'])
+
+    # Ensure 'Date' column is in datetime format
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+    # Ensure 'Talk Time Duration' and 'Call Duration' are numeric
+    df['Talk Time Duration'] = pd.to_numeric(df['Talk Time Duration'], errors='coerce').fillna(0)
+    df['Call Duration'] = pd.to_numeric(df['Call Duration'], errors='coerce').fillna(0)
+    return df
+
+
+# Classify the skip statuses of a cleaned frame with a compiled taxonomy (the current one by default).
+# It runs once per distinct status, so a frame is cheap to reclassify when the taxonomy changes.
+def classify_remarks(df, taxonomy=None):
+    df['Skip Category'] = classify_statuses(df['Status'], taxonomy)
+    return df
+
+
+# Seconds after midnight of every Time value, parsed once per distinct value. Excel time cells arrive as
+# datetime.time; anything else is parsed with pd.to_datetime. Missing or unreadable values get MISSING_TIME.
+def time_seconds(values):
+    codes, uniques = pd.factorize(values)
+    is_time = np.array([isinstance(value, datetime.time) for value in uniques], dtype=bool)
+    parsed = pd.to_datetime(pd.Series(np.where(is_time, None, uniques), dtype=object), errors='coerce')
+    seconds = (parsed.dt.hour * 3600 + parsed.dt.minute * 60 + parsed.dt.second).fillna(MISSING_TIME).to_numpy()
+    for idx in np.flatnonzero(is_time):
+        seconds[idx] = uniques[idx].hour * 3600 + uniques[idx].minute * 60 + uniques[idx].second
+    # Missing values (code -1) pick up the trailing MISSING_TIME entry
+    return np.append(seconds, MISSING_TIME).astype(np.int32)[codes]
+
+
+# Convert a cell the way pandas' openpyxl reader does: integral floats become ints, blanks become ""
+def _convert_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+# Parse one chunk of raw rows with pandas' own Excel text parser (NA strings, numeric inference), then clean
+# and compact it
+def _parse_chunk(rows):
+    chunk = TextParser(rows, names=REQUIRED_COLUMNS, header=None).read()
+    # 'Remark' is only needed for the broken promise filter
+    return compact_columns(clean_remarks(chunk).drop(columns=['Remark']))
+
+
+# Categories in the order astype('category') gives the whole column, which depends only on the distinct values
+def _column_categories(values):
+    return pd.Series(values.categories, dtype=values.categories.dtype).astype('category').cat.categories
+
+
+# Concatenate compact chunks. Categorical columns are combined through their codes, so no chunk is ever
+# expanded back to objects, and end up with the categories of a column compacted in one piece.
+def _concat_chunks(chunks):
+    df = pd.concat([chunk.drop(columns=CATEGORICAL_COLUMNS) for chunk in chunks], ignore_index=True)
+    for column in CATEGORICAL_COLUMNS:
+        parts = [chunk[column].array for chunk in chunks]
+        # A column that is numeric in one chunk and text in another has object categories, as in one piece
+        if len({part.categories.dtype for part in parts}) > 1:
+            parts = [pd.Categorical.from_codes(part.codes, part.categories.astype(object)) for part in parts]
+        values = union_categoricals(parts)
+        df[column] = values.set_categories(_column_categories(values))
+    return df[chunks[0].columns]
+
+
+# Stream the first sheet of a Daily Remark workbook in row chunks, keeping only REQUIRED_COLUMNS.
+# Each chunk is filtered, coerced and compacted as soon as it is read, so only one chunk of raw rows is
+# held at a time and peak memory stays close to the compact result.
+def read_remarks(source, chunk_rows=CHUNK_ROWS):
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Daily Remark file is missing columns: {', '.join(missing)}")
+        positions = [header.index(column) for column in REQUIRED_COLUMNS]
+
+        chunks = []
+        buffer = []
+        for row in rows:
+            values = [_convert_cell(row[idx]) if idx < len(row) else "" for idx in positions]
+            # Blank rows carry no Date, so they can never reach a report
+            if all(value == "" for value in values):
+                continue
+            buffer.append(values)
+            if len(buffer) >= chunk_rows:
+                chunks.append(_parse_chunk(buffer))
+                buffer = []
+        if buffer or not chunks:
+            chunks.append(_parse_chunk(buffer))
+    finally:
+        workbook.close()
+
+    return sort_by_day(_concat_chunks(chunks))
+
+
+# Compact a cleaned frame, then sort it by day
+def compact_remarks(df):
+    return sort_by_day(compact_columns(df))
+
+
+# Compact the columns of a cleaned frame: repetitive text columns become categoricals, whole-second
+# durations int32 and the remark date an int32 'Day' number
+def compact_columns(df):
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+    for column in DURATION_COLUMNS:
+        df[column] = _compact_durations(df[column])
+    df['Day'] = day_numbers(df['Date'])
+    return df.drop(columns=['Date'])
+
+
+# Durations that are all whole seconds within int32 range are stored as int32; any other column stays
+# float64, so every sum over it is unchanged
+def _compact_durations(values):
+    array = values.to_numpy()
+    if len(array) and (not np.isfinite(array).all() or (array % 1 != 0).any() or np.abs(array).max() > np.iinfo(np.int32).max):
+        return values
+    return values.astype(np.int32)
+
+
+# Day numbers of datetime values, MISSING_DAY where the date is missing
+def day_numbers(dates):
+    days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    return pd.Series(np.where(dates.isna(), MISSING_DAY, days).astype(np.int32), index=dates.index)
+
+
+# Day number of a date
+def day_number(date):
+    return (pd.Timestamp(date).normalize() - pd.Timestamp(EPOCH)).days
+
+
+# datetime64 days of day numbers (NaT for MISSING_DAY)
+def day_dates(days):
+    days = np.asarray(days, dtype=np.int64)
+    return np.where(days == MISSING_DAY, np.datetime64('NaT'), days.astype('datetime64[D]')).astype('datetime64[ns]')
+
+
+# First and last remark day of a compact frame, as dates
+def date_bounds(df):
+    days = df['Day'][df['Day'] != MISSING_DAY]
+    return EPOCH + datetime.timedelta(days=int(days.min())), EPOCH + datetime.timedelta(days=int(days.max()))
+
+
+# Sort a compact frame by its 'Day' number (missing dates last), so any date range is one contiguous slice.
+# The sort is stable and the index keeps each row's position in the file.
+def sort_by_day(df):
+    return df.sort_values('Day', kind='stable')
+
+
+# Rows of a day-sorted frame between start_date and end_date (inclusive), found by binary search
+def select_date_range(df, start_date, end_date):
+    with stage('filter') as counts:
+        days = df['Day'].to_numpy()
+        start = days.searchsorted(day_number(start_date), side='left')
+        end = days.searchsorted(day_number(end_date), side='right')
+        counts['rows'] = int(end - start)
+        return df.iloc[start:end]
+
+
+# Load a Daily Remark workbook from its bytes, reusing the on-disk cache when this exact file was seen before.
+# Returns the content hash with the cleaned frame; a hash already computed by the caller can be passed in.
+# The cached frame does not depend on the skip taxonomy: statuses are classified after loading it.
+def load_remarks(data, key=None, taxonomy=None):
+    with stage('load') as counts:
+        key = key or content_hash(data)
+        df = load_cached_frame(key)
+        counts['cached'] = df is not None
+        if df is None:
+            df = read_remarks(BytesIO(data))
+            store_cached_frame(key, df)
+        counts['rows'] = len(df)
+    return key, classify_remarks(df, taxonomy)
@@ -0,0 +1,426 @@
+import numpy as np
+import pandas as pd
+
+from classifier import NEGATIVE_SKIP, POSITIVE_SKIP, RPC_SKIP, classify_statuses
+from ingest import MISSING_DAY, day_dates, day_numbers
+from profiling import stage
+
+# Column layouts of the four report tables
+CLIENT_SUMMARY_COLUMNS = [
+    'Date Range', 'Client', 'Collectors', 'Manual Call', 'Manual Accounts', 'Total Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+    'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected',
+    'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+    'Positive Skip Ave', 'Negative Skip Ave', 'RPC Skip Ave', 'Total Skip Ave', 'Talk Time (HH:MM:SS)', 'Connected Ave', 'Talk Time Ave'
+]
+COLLECTOR_SUMMARY_COLUMNS = ['Date Range', 'Collector'] + CLIENT_SUMMARY_COLUMNS[2:]
+CLIENT_DAILY_COLUMNS = [
+    'Day', 'Collectors Count', 'Manual Call', 'Manual Accounts', 'Total Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+    'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected',
+    'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+    'Talk Time (HH:MM:SS)', 'Positive Skip Ave', 'Negative Skip Ave', 'RPC Skip Ave', 'Total Skip Ave', 'Connected Ave', 'Talk Time Ave'
+]
+COLLECTOR_DAILY_COLUMNS = [
+    'Day', 'Collector', 'Client', 'Manual Call', 'Manual Accounts', 'Total Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+    'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected',
+    'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+    'Talk Time (HH:MM:SS)'
+]
+# Column layout of the hourly collector table
+HOURLY_COLUMNS = [
+    'Collector', 'Hour', 'Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip', 'Talk Time (HH:MM:SS)'
+]
+
+SKIP_KINDS = {'positive': POSITIVE_SKIP, 'negative': NEGATIVE_SKIP, 'rpc': RPC_SKIP}
+
+# Grouping of the pre-aggregated frame: one row per day, client and collector
+GROUP_KEYS = ['day', 'Client', 'Remark By']
+
+# Columns of a cleaned, day-sorted frame that build_flags reads
+FLAG_COLUMNS = [
+    'Client', 'Remark By', 'Day', 'Remark Type', 'Call Status', 'Account No.', 'Talk Time Duration', 'Call Duration', 'Skip Category'
+]
+
+# Named aggregations summed per group; every report figure except distinct accounts is a sum of these
+SUM_AGG = {
+    'valid_calls': ('valid_call', 'sum'),
+    'manual_calls': ('is_outgoing', 'sum'),
+    'total_connected': ('connected_account', 'sum'),
+    'talk_time': ('talk_time', 'sum'),
+    **{f'{kind}_skip': (f'is_{kind}', 'sum') for kind in SKIP_KINDS},
+    **{f'{kind}_skip_connected': (f'{kind}_connected_account', 'sum') for kind in SKIP_KINDS},
+    **{f'{kind}_skip_talk_time': (f'{kind}_connected_talk_time', 'sum') for kind in SKIP_KINDS},
+}
+SUM_COLUMNS = list(SUM_AGG)
+
+# Grouping of the hourly pre-aggregates: one row per day, collector and hour of day
+HOURLY_KEYS = ['day', 'Remark By', 'hour']
+HOURLY_SUM_COLUMNS = ['connected', 'positive_skip', 'negative_skip', 'rpc_skip', 'talk_time']
+
+# Daily counts that are averaged per collector for the overall summaries
+AVERAGED_COUNTS = {
+    'Positive Skip Ave': 'positive_skip',
+    'Negative Skip Ave': 'negative_skip',
+    'RPC Skip Ave': 'rpc_skip',
+    'Total Skip Ave': 'total_skip',
+    'Connected Ave': 'total_connected',
+}
+
+
+# Talk time columns of the report tables: whole seconds, formatted as HH:MM:SS only for display
+DURATION_COLUMNS = ['Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time', 'Talk Time (HH:MM:SS)', 'Talk Time Ave']
+
+
+# Whole seconds of duration values, truncated toward zero like int(); values that are not finite stay missing
+def whole_seconds(values):
+    values = np.trunc(np.asarray(values, dtype=np.float64))
+    finite = np.isfinite(values)
+    if finite.all():
+        return values.astype(np.int64)
+    return np.where(finite, values, np.nan)
+
+
+# Format a column of seconds as HH:MM:SS in one pass; missing values stay missing
+def format_hms_column(seconds):
+    seconds = pd.Series(seconds)
+    valid = seconds[seconds.notna()].astype(np.int64)
+    hours, remainder = np.divmod(valid, 3600)
+    minutes, secs = np.divmod(remainder, 60)
+    text = hours.astype(str).str.zfill(2) + ':' + minutes.astype(str).str.zfill(2) + ':' + secs.astype(str).str.zfill(2)
+    return text.reindex(seconds.index)
+
+
+# Copy of a report table with its duration columns formatted as HH:MM:SS, for display
+def format_durations(table):
+    table = table.copy()
+    for column in DURATION_COLUMNS:
+        if column in table.columns:
+            table[column] = format_hms_column(table[column]).to_numpy()
+    return table
+
+
+# Evaluate a text condition on a column. On a categorical column it runs once per category (and once for a
+# missing value) and reaches the rows through the integer codes, so nothing is lowercased or compared per row.
+def match_values(column, condition):
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return condition(column)
+    values = pd.Series(list(column.cat.categories) + [np.nan], dtype=object)
+    matches = condition(values).to_numpy(dtype=bool)
+    # Missing values (code -1) pick up the trailing entry
+    return pd.Series(matches[column.cat.codes.to_numpy()], index=column.index)
+
+
+# Compute every per-row condition the reports count, once, so each aggregate is a plain groupby sum
+def build_flags(df):
+    is_outgoing = match_values(df['Remark Type'], lambda values: values.str.lower() == 'outgoing')
+    is_connected = match_values(df['Call Status'], lambda values: values == 'CONNECTED')
+    has_account = df['Account No.'].notna()
+    is_user = match_values(df['Remark By'], lambda values: values.str.lower() != "system")
+    valid_call = (df['Call Duration'].notna()) & (df['Call Duration'] > 0) & is_user
+    skip_category = df['Skip Category'] if 'Skip Category' in df else classify_statuses(df['Status'])
+    skip = {kind: (skip_category & code) != 0 for kind, code in SKIP_KINDS.items()}
+
+    flags = pd.DataFrame({
+        'Client': df['Client'],
+        'Remark By': df['Remark By'],
+        'day': df['Day'] if 'Day' in df else day_numbers(df['Date']),
+        'is_outgoing': is_outgoing,
+        'outgoing_account': df['Account No.'].where(is_outgoing),
+        'connected_account': is_connected & has_account,
+        'talk_time': df['Talk Time Duration'],
+        'valid_call': valid_call,
+    }, index=df.index)
+    for kind in SKIP_KINDS:
+        flags[f'is_{kind}'] = skip[kind]
+        flags[f'{kind}_connected_account'] = is_connected & skip[kind] & has_account
+        flags[f'{kind}_connected_talk_time'] = df['Talk Time Duration'].where(is_connected & skip[kind], 0)
+    return flags
+
+
+# Per-entity mean of daily values, summed the way Series.mean sums (pairwise, NaN skipped) rather
+# than with groupby().mean()'s compensated sum, so the rounded averages match per-entity means exactly.
+# The daily frame must be sorted by entity, as groupby output is.
+def _entity_means(values, entity_codes):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values
+    starts = np.flatnonzero(np.r_[True, entity_codes[1:] != entity_codes[:-1]])
+    missing = np.isnan(values)
+    # A leading zero per entity makes reduceat sum each whole slice pairwise, like ndarray.sum
+    padded_starts = starts + np.arange(len(starts))
+    sums = np.add.reduceat(np.insert(np.where(missing, 0.0, values), starts, 0.0), padded_starts)
+    counts = np.add.reduceat(np.insert((~missing).astype(np.float64), starts, 0.0), padded_starts)
+    with np.errstate(invalid='ignore'):
+        return sums / counts
+
+
+# Total Skip plus the whole-second talk times shared by the overall and daily tables
+def _add_derived_columns(totals):
+    totals['total_skip'] = totals['positive_skip'] + totals['negative_skip'] + totals['rpc_skip']
+    for kind in SKIP_KINDS:
+        totals[f'{kind}_skip_talk_time_seconds'] = whole_seconds(totals[f'{kind}_skip_talk_time'])
+    totals['talk_time_seconds'] = whole_seconds(totals['talk_time'])
+    return totals
+
+
+# Overall summary of one entity type: range totals plus the mean of the daily per-collector ratios
+def _overall_summary(entity, totals, daily, day_collectors, collectors, date_range_str):
+    entity_codes = pd.factorize(daily.index.get_level_values(0))[0]
+    averages = {
+        column: _entity_means(daily[count] / day_collectors, entity_codes).round(2)
+        for column, count in AVERAGED_COUNTS.items()
+    }
+    talk_time_ave_seconds = _entity_means(daily['talk_time'] / day_collectors, entity_codes)
+    return pd.DataFrame({
+        'Date Range': date_range_str,
+        'Client' if entity == 'Client' else 'Collector': totals.index.to_numpy(),
+        'Collectors': collectors.reindex(totals.index, fill_value=0).to_numpy(),
+        'Manual Call': totals['manual_calls'].to_numpy(),
+        'Manual Accounts': totals['manual_accounts'].to_numpy(),
+        'Total Connected': totals['total_connected'].to_numpy(),
+        'Positive Skip': totals['positive_skip'].to_numpy(),
+        'Negative Skip': totals['negative_skip'].to_numpy(),
+        'RPC Skip': totals['rpc_skip'].to_numpy(),
+        'Total Skip': totals['total_skip'].to_numpy(),
+        'Positive Skip Connected': totals['positive_skip_connected'].to_numpy(),
+        'Negative Skip Connected': totals['negative_skip_connected'].to_numpy(),
+        'RPC Skip Connected': totals['rpc_skip_connected'].to_numpy(),
+        'Positive Skip Talk Time': totals['positive_skip_talk_time_seconds'].to_numpy(),
+        'Negative Skip Talk Time': totals['negative_skip_talk_time_seconds'].to_numpy(),
+        'RPC Skip Talk Time': totals['rpc_skip_talk_time_seconds'].to_numpy(),
+        'Positive Skip Ave': averages['Positive Skip Ave'],
+        'Negative Skip Ave': averages['Negative Skip Ave'],
+        'RPC Skip Ave': averages['RPC Skip Ave'],
+        'Total Skip Ave': averages['Total Skip Ave'],
+        'Talk Time (HH:MM:SS)': totals['talk_time_seconds'].to_numpy(),
+        'Connected Ave': averages['Connected Ave'],
+        'Talk Time Ave': whole_seconds(talk_time_ave_seconds),
+    })
+
+
+# Split a table indexed by (entity, day) into one frame per entity
+def _split_by_entity(table):
+    return {key: group.reset_index(drop=True) for key, group in table.groupby(level=0, sort=True, observed=True)}
+
+
+# Pre-aggregate remark rows into mergeable parts: per (day, client, collector) sums, with the position
+# of the group's first row, and the distinct outgoing accounts of each group.
+# Row positions follow the index, which keeps the file order when the frame is sorted by day;
+# positions can also be given directly when df is one part of a larger frame.
+# Aggregates of different row sets can be concatenated and fed to report_tables_from_aggregates.
+def aggregate_remarks(df, first_row=0, positions=None):
+    with stage('aggregate', rows=len(df)) as counts:
+        if positions is None:
+            positions = row_positions(df.index, first_row)
+        day_aggregates, outgoing_accounts = _aggregate_remarks(df, positions)
+        counts['groups'] = len(day_aggregates)
+    return day_aggregates, outgoing_accounts
+
+
+# Position of every row in file order, counted from first_row: the rank of its index label
+def row_positions(index, first_row=0):
+    positions = np.empty(len(index), dtype=np.int64)
+    positions[np.argsort(index.to_numpy(), kind='stable')] = np.arange(first_row, first_row + len(index))
+    return positions
+
+
+def _aggregate_remarks(df, positions):
+    flags = build_flags(df)
+    flags['row'] = positions
+    flags = flags[flags['day'] != MISSING_DAY]
+    day_aggregates = flags.groupby(GROUP_KEYS, observed=True, dropna=False).agg(
+        first_row=('row', 'min'), **SUM_AGG
+    ).reset_index()
+    outgoing_accounts = flags.loc[flags['outgoing_account'].notna(), GROUP_KEYS + ['outgoing_account']]
+    outgoing_accounts = outgoing_accounts.drop_duplicates().rename(columns={'outgoing_account': 'Account No.'}).reset_index(drop=True)
+    # Grouping runs on the int32 day numbers; the parts carry datetime64 days
+    day_aggregates['day'] = day_dates(day_aggregates['day'])
+    outgoing_accounts['day'] = day_dates(outgoing_accounts['day'])
+    return day_aggregates, outgoing_accounts
+
+
+# Re-aggregate the pre-aggregated parts to the given keys, with Manual Accounts counted from the distinct accounts
+def _totals(day_aggregates, outgoing_accounts, keys):
+    totals = day_aggregates.groupby(keys, observed=True)[SUM_COLUMNS].sum()
+    manual_accounts = outgoing_accounts.groupby(keys, observed=True)['Account No.'].nunique()
+    totals['manual_accounts'] = manual_accounts.reindex(totals.index, fill_value=0)
+    return _add_derived_columns(totals)
+
+
+# Date Range label of the overall summaries
+def format_date_range(start_date, end_date):
+    return f"{start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}"
+
+
+# Collector averages round up from .5 and down below it (math.ceil if x % 1 >= 0.5 else round(x)), for all clients at once
+def _round_half_up(averages):
+    return (np.floor(averages) + (averages % 1 >= 0.5)).astype(np.int64)
+
+
+# Per-client, per-day totals with the number of collectors who made a valid call that day;
+# they feed both the client daily tables and the client averages
+def _client_daily(day_aggregates, outgoing_accounts):
+    client_daily = _totals(day_aggregates, outgoing_accounts, ['Client', 'day'])
+    valid_collectors = day_aggregates[(day_aggregates['valid_calls'] > 0) & day_aggregates['Remark By'].notna()]
+    client_daily['collectors'] = valid_collectors.groupby(['Client', 'day'], observed=True).size().reindex(client_daily.index, fill_value=0)
+    return client_daily
+
+
+# Collector tables leave out the "system" user
+def _collector_parts(day_aggregates, outgoing_accounts):
+    collector_aggregates = day_aggregates[day_aggregates['Remark By'].str.lower() != "system"]
+    collector_accounts = outgoing_accounts[outgoing_accounts['Remark By'].str.lower() != "system"]
+    return collector_aggregates, collector_accounts
+
+
+# Overall summary per client from pre-aggregated parts covering the selected date range
+def overall_client_summary(day_aggregates, outgoing_accounts, date_range_str):
+    client_daily = _client_daily(day_aggregates, outgoing_accounts)
+    valid_days = client_daily.loc[client_daily['valid_calls'] > 0, 'collectors']
+    avg_collectors_per_client = _round_half_up(valid_days.groupby('Client', observed=True).mean())
+    client_totals = _totals(day_aggregates, outgoing_accounts, ['Client'])
+    return _overall_summary(
+        'Client', client_totals, client_daily, client_daily['collectors'], avg_collectors_per_client, date_range_str
+    )
+
+
+# Overall summary per collector; each collector counts as one agent per day
+def overall_collector_summary(day_aggregates, outgoing_accounts, date_range_str):
+    collector_aggregates, collector_accounts = _collector_parts(day_aggregates, outgoing_accounts)
+    collector_totals = _totals(collector_aggregates, collector_accounts, ['Remark By'])
+    collector_daily = _totals(collector_aggregates, collector_accounts, ['Remark By', 'day'])
+    return _overall_summary(
+        'Remark By', collector_totals, collector_daily, 1, pd.Series(1, index=collector_totals.index), date_range_str
+    )
+
+
+# Daily skip averages as the original loops rounded them: Python ints divided and passed to round(), which
+# rounds the float's exact value, while Series.round(2) scales by 100 and rounds half to even (1/40 gives
+# 0.03 with round(), 0.02 with Series.round(2)). Days without collectors average 0.
+def _round_ratios(counts, agents):
+    return [round(count / agent, 2) if agent > 0 else 0 for count, agent in zip(counts.tolist(), agents.tolist())]
+
+
+# Per-day table of every client, keyed by client
+def client_daily_tables(day_aggregates, outgoing_accounts):
+    client_daily = _client_daily(day_aggregates, outgoing_accounts)
+    agents = client_daily['collectors']
+    client_daily_table = pd.DataFrame({
+        'Day': client_daily.index.get_level_values('day').strftime('%d/%m/%Y'),
+        'Collectors Count': agents.to_numpy(),
+        'Manual Call': client_daily['manual_calls'].to_numpy(),
+        'Manual Accounts': client_daily['manual_accounts'].to_numpy(),
+        'Total Connected': client_daily['total_connected'].to_numpy(),
+        'Positive Skip': client_daily['positive_skip'].to_numpy(),
+        'Negative Skip': client_daily['negative_skip'].to_numpy(),
+        'RPC Skip': client_daily['rpc_skip'].to_numpy(),
+        'Total Skip': client_daily['total_skip'].to_numpy(),
+        'Positive Skip Connected': client_daily['positive_skip_connected'].to_numpy(),
+        'Negative Skip Connected': client_daily['negative_skip_connected'].to_numpy(),
+        'RPC Skip Connected': client_daily['rpc_skip_connected'].to_numpy(),
+        'Positive Skip Talk Time': client_daily['positive_skip_talk_time_seconds'].to_numpy(),
+        'Negative Skip Talk Time': client_daily['negative_skip_talk_time_seconds'].to_numpy(),
+        'RPC Skip Talk Time': client_daily['rpc_skip_talk_time_seconds'].to_numpy(),
+        'Talk Time (HH:MM:SS)': client_daily['talk_time_seconds'].to_numpy(),
+    }, index=client_daily.index)
+    for column, count in AVERAGED_COUNTS.items():
+        if column == 'Connected Ave':
+            client_daily_table[column] = (client_daily[count] / agents).round(2).where(agents > 0, 0)
+        else:
+            client_daily_table[column] = _round_ratios(client_daily[count], agents)
+    client_daily_table['Talk Time Ave'] = whole_seconds((client_daily['talk_time'] / agents).where(agents > 0, 0))
+    return _split_by_entity(client_daily_table)
+
+
+# Per-day table of every collector, keyed by collector
+def collector_daily_tables(day_aggregates, outgoing_accounts):
+    collector_aggregates, collector_accounts = _collector_parts(day_aggregates, outgoing_accounts)
+    collector_daily = _totals(collector_aggregates, collector_accounts, ['Remark By', 'day'])
+    # A collector's client is the one on their first remark row
+    first_rows = collector_aggregates.sort_values('first_row', kind='stable').drop_duplicates('Remark By')
+    collector_client = first_rows.set_index('Remark By')['Client']
+    collector_daily_table = pd.DataFrame({
+        'Day': collector_daily.index.get_level_values('day').strftime('%d/%m/%Y'),
+        'Collector': collector_daily.index.get_level_values('Remark By').to_numpy(),
+        'Client': collector_client.reindex(collector_daily.index.get_level_values('Remark By')).to_numpy(),
+        'Manual Call': collector_daily['manual_calls'].to_numpy(),
+        'Manual Accounts': collector_daily['manual_accounts'].to_numpy(),
+        'Total Connected': collector_daily['total_connected'].to_numpy(),
+        'Positive Skip': collector_daily['positive_skip'].to_numpy(),
+        'Negative Skip': collector_daily['negative_skip'].to_numpy(),
+        'RPC Skip': collector_daily['rpc_skip'].to_numpy(),
+        'Total Skip': collector_daily['total_skip'].to_numpy(),
+        'Positive Skip Connected': collector_daily['positive_skip_connected'].to_numpy(),
+        'Negative Skip Connected': collector_daily['negative_skip_connected'].to_numpy(),
+        'RPC Skip Connected': collector_daily['rpc_skip_connected'].to_numpy(),
+        'Positive Skip Talk Time': collector_daily['positive_skip_talk_time_seconds'].to_numpy(),
+        'Negative Skip Talk Time': collector_daily['negative_skip_talk_time_seconds'].to_numpy(),
+        'RPC Skip Talk Time': collector_daily['rpc_skip_talk_time_seconds'].to_numpy(),
+        'Talk Time (HH:MM:SS)': collector_daily['talk_time_seconds'].to_numpy(),
+    }, index=collector_daily.index)
+    return _split_by_entity(collector_daily_table)
+
+
+# Pre-aggregate remark rows into per (day, collector, hour) sums of connected calls, skips and talk time.
+# The hour is an integer key, the remark's seconds after midnight // 3600, so no time objects are built;
+# remarks without a time or a day, and the "system" user, are left out. Like aggregate_remarks' parts,
+# hourly aggregates of different row sets can be concatenated.
+def aggregate_hourly(df):
+    with stage('hourly aggregate', rows=len(df)) as counts:
+        hour = df['Time'].to_numpy() // 3600
+        is_connected = match_values(df['Call Status'], lambda values: values == 'CONNECTED')
+        skip_category = df['Skip Category'] if 'Skip Category' in df else classify_statuses(df['Status'])
+        is_collector = match_values(df['Remark By'], lambda values: values.notna() & (values.str.lower() != "system"))
+        hourly = pd.DataFrame({
+            'day': df['Day'],
+            'Remark By': df['Remark By'],
+            'hour': hour.astype(np.int8),
+            'connected': is_connected & df['Account No.'].notna(),
+            **{f'{kind}_skip': (skip_category & code) != 0 for kind, code in SKIP_KINDS.items()},
+            'talk_time': df['Talk Time Duration'],
+        }, index=df.index)
+        hourly = hourly[is_collector & (hour >= 0) & (df['Day'] != MISSING_DAY)]
+        hourly = hourly.groupby(HOURLY_KEYS, observed=True)[HOURLY_SUM_COLUMNS].sum().reset_index()
+        hourly['day'] = day_dates(hourly['day'])
+        counts['groups'] = len(hourly)
+    return hourly
+
+
+# Per collector and hour of day totals over every day of the hourly aggregates, in collector and hour order
+def hourly_collector_table(hourly_aggregates):
+    totals = hourly_aggregates.groupby(['Remark By', 'hour'], observed=True)[HOURLY_SUM_COLUMNS].sum()
+    hours = totals.index.get_level_values('hour').to_numpy()
+    return pd.DataFrame({
+        'Collector': totals.index.get_level_values('Remark By').to_numpy(),
+        'Hour': pd.Series(hours).astype(str).str.zfill(2).to_numpy() + ':00',
+        'Connected': totals['connected'].to_numpy(),
+        'Positive Skip': totals['positive_skip'].to_numpy(),
+        'Negative Skip': totals['negative_skip'].to_numpy(),
+        'RPC Skip': totals['rpc_skip'].to_numpy(),
+        'Total Skip': (totals['positive_skip'] + totals['negative_skip'] + totals['rpc_skip']).to_numpy(),
+        'Talk Time (HH:MM:SS)': whole_seconds(totals['talk_time']),
+    }, columns=HOURLY_COLUMNS)
+
+
+# Build the four MC06 report tables from pre-aggregated parts covering the selected date range:
+# the overall client and collector summaries and the per-day tables of every client and collector
+def report_tables_from_aggregates(day_aggregates, outgoing_accounts, start_date, end_date):
+    date_range_str = format_date_range(start_date, end_date)
+    # Profiled stages count the pre-aggregated rows read and the summary rows or per-day tables produced
+    with stage('client summary', rows=len(day_aggregates)) as counts:
+        overall_client_summary_df = overall_client_summary(day_aggregates, outgoing_accounts, date_range_str)
+        counts['groups'] = len(overall_client_summary_df)
+    with stage('collector summary', rows=len(day_aggregates)) as counts:
+        overall_collector_summary_df = overall_collector_summary(day_aggregates, outgoing_accounts, date_range_str)
+        counts['groups'] = len(overall_collector_summary_df)
+    with stage('client daily tables', rows=len(day_aggregates)) as counts:
+        client_summary_dfs = client_daily_tables(day_aggregates, outgoing_accounts)
+        counts['groups'] = len(client_summary_dfs)
+    with stage('collector daily tables', rows=len(day_aggregates)) as counts:
+        collector_summary_dfs = collector_daily_tables(day_aggregates, outgoing_accounts)
+        counts['groups'] = len(collector_summary_dfs)
+    return overall_client_summary_df, overall_collector_summary_df, client_summary_dfs, collector_summary_dfs
+
+
+# Build the four MC06 report tables from the date-filtered remark rows
+def build_report_tables(filtered_df, start_date, end_date):
+    return report_tables_from_aggregates(*aggregate_remarks(filtered_df), start_date, end_date)
@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from metrics import FLAG_COLUMNS, GROUP_KEYS, aggregate_remarks, build_report_tables, report_tables_from_aggregates, row_positions
+from profiling import stage
+
+# Worker processes for the report aggregation; 1 keeps everything in the calling process
+JOBS = int(os.environ.get('MC06_JOBS', '1'))
+# Smaller date ranges are aggregated in process: shipping them to workers costs more than it saves
+PARALLEL_MIN_ROWS = int(os.environ.get('MC06_PARALLEL_MIN_ROWS', '200000'))
+
+_executor = None
+_executor_jobs = 0
+_executor_lock = threading.Lock()
+
+
+# Streamlit runs the app script as __main__, and spawned workers would re-run it on start-up,
+# so workers are forked where the platform allows it
+def mp_context():
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+# One worker pool per process, shared by every session
+def _get_executor(jobs):
+    global _executor, _executor_jobs
+    with _executor_lock:
+        if _executor is None or _executor_jobs != jobs:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context())
+            _executor_jobs = jobs
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+# Split the rows into at most `parts` groups of whole clients, largest clients first onto the
+# lightest part, so every (day, client, collector) group is computed by exactly one worker.
+# Rows without a client form a client of their own. Returns one array of row numbers per non-empty part.
+def client_partitions(df, parts):
+    codes, _ = pd.factorize(df['Client'], use_na_sentinel=False)
+    sizes = np.bincount(codes)
+    loads = np.zeros(parts, dtype=np.int64)
+    part_of_client = np.empty(len(sizes), dtype=np.int64)
+    for client in np.argsort(-sizes, kind='stable'):
+        part = int(np.argmin(loads))
+        part_of_client[client] = part
+        loads[part] += sizes[client]
+    row_parts = part_of_client[codes]
+    return [rows for rows in (np.flatnonzero(row_parts == part) for part in range(parts)) if len(rows)]
+
+
+# Pre-aggregate the rows of a day-sorted frame in worker processes, one client partition each, and merge
+# the partial aggregates. Sums and distinct accounts of a group come from a single partition, and row
+# positions are taken over the whole frame, so the merged parts equal aggregate_remarks(df).
+def parallel_aggregate_remarks(df, jobs=JOBS):
+    with stage('parallel aggregate', rows=len(df)) as counts:
+        positions = row_positions(df.index)
+        columns = [column for column in FLAG_COLUMNS if column in df.columns]
+        executor = _get_executor(jobs)
+        try:
+            futures = [
+                executor.submit(aggregate_remarks, df.iloc[rows][columns], 0, positions[rows])
+                for rows in client_partitions(df, jobs)
+            ]
+            parts = [future.result() for future in futures]
+        except BrokenProcessPool:
+            _reset_executor()
+            raise
+        # Restore the single-process group order, so later sums run in the same order
+        day_aggregates = pd.concat([part[0] for part in parts], ignore_index=True)
+        day_aggregates = day_aggregates.sort_values(GROUP_KEYS, kind='stable').reset_index(drop=True)
+        outgoing_accounts = pd.concat([part[1] for part in parts], ignore_index=True)
+        counts['groups'] = len(day_aggregates)
+    return day_aggregates, outgoing_accounts
+
+
+# Build the four report tables from the date-filtered rows, aggregating in worker processes when
+# more than one job is configured and the selection is large enough to benefit
+def build_report_tables_parallel(filtered_df, start_date, end_date, jobs=JOBS, min_rows=PARALLEL_MIN_ROWS):
+    if jobs <= 1 or len(filtered_df) < min_rows:
+        return build_report_tables(filtered_df, start_date, end_date)
+    return report_tables_from_aggregates(*parallel_aggregate_remarks(filtered_df, jobs), start_date, end_date)
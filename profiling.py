@@ -0,0 +1,69 @@
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Optional JSON-lines file that every profiled run is appended to
+PROFILE_LOG = os.environ.get('MC06_PROFILE_LOG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mc06_profile.jsonl'))
+
+# Each Streamlit session runs its script on its own thread, so every thread collects its own profile
+_local = threading.local()
+
+
+# Start collecting stage timings on this thread, replacing any profile left over from an interrupted run
+def start_profile(**context):
+    _local.profile = {
+        'started_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'start': time.perf_counter(),
+        'context': context,
+        'stages': [],
+    }
+    return _local.profile
+
+
+# Stop collecting and return the profile of this thread, or None when profiling was off
+def stop_profile():
+    profile = getattr(_local, 'profile', None)
+    _local.profile = None
+    if profile is not None:
+        profile['seconds'] = round(time.perf_counter() - profile.pop('start'), 6)
+    return profile
+
+
+# Time a pipeline stage when a profile is being collected, with the row and group counts it processed.
+# Counts known only after the work is done can be added to the yielded dict. Without a profile this does nothing.
+@contextmanager
+def stage(name, **counts):
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        yield counts
+        return
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        profile['stages'].append({'stage': name, 'seconds': round(time.perf_counter() - start, 6), **counts})
+
+
+# One row per stage name, in first-run order: calls, total seconds and total counts.
+# Stages may run inside each other (coercion runs inside load), so seconds do not add up to the run time.
+def profile_table(profile):
+    stages = pd.DataFrame(profile['stages'], columns=['stage', 'seconds', 'rows', 'groups'])
+    if stages.empty:
+        return pd.DataFrame(columns=['Stage', 'Calls', 'Seconds', 'Rows', 'Groups'])
+    grouped = stages.groupby('stage', sort=False)
+    table = grouped[['seconds', 'rows', 'groups']].sum(min_count=1).rename(columns=str.title)
+    table.insert(0, 'Calls', grouped.size())
+    table['Seconds'] = table['Seconds'].round(3)
+    table[['Rows', 'Groups']] = table[['Rows', 'Groups']].astype('Int64')
+    return table.rename_axis('Stage').reset_index()
+
+
+# Append a finished profile to a JSON-lines file, one line per run
+def log_profile(profile, path=PROFILE_LOG):
+    with open(path, 'a') as f:
+        f.write(json.dumps(profile, default=str) + '\n')
@@ -0,0 +1,370 @@
+import math
+
+import pandas as pd
+
+from classifier import negative_skip_status, positive_skip_keywords, rpc_skip_status
+
+# Frozen copy of the original per-client and per-collector loops of the MC06 app, kept as the golden
+# reference the optimized paths are checked against (see equivalence.py). Do not optimize or tidy this
+# module: its quirks (the unescaped positive skip regex, ceil-if->=0.5 collector rounding, daily means of
+# per-collector ratios, "system" exclusion) are exactly what the fast paths must reproduce.
+
+
+# The original upload loading and column coercions, on a workbook path or file object
+def reference_load_remarks(source):
+    return reference_clean_remarks(pd.read_excel(source))
+
+
+# The original cleaning of a raw Daily Remark frame
+def reference_clean_remarks(df):
+    # Filter out rows where 'Remark' contains "broken promise" (case-insensitive)
+    df = df[~df['Remark'].astype(str).str.contains("broken promise", case=False, na=False)].copy()
+
+    # Ensure 'Time' column is in datetime format
+    df['Time'] = pd.to_datetime(df['Time'], errors='coerce').dt.time
+
+    # Ensure 'Date' column is in datetime format
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+    # Ensure 'Talk Time Duration' and 'Call Duration' are numeric
+    df['Talk Time Duration'] = pd.to_numeric(df['Talk Time Duration'], errors='coerce').fillna(0)
+    df['Call Duration'] = pd.to_numeric(df['Call Duration'], errors='coerce').fillna(0)
+    return df
+
+
+# The original date range filter
+def reference_select_date_range(df, start_date, end_date):
+    return df[(df['Date'].dt.date >= start_date) & (df['Date'].dt.date <= end_date)]
+
+
+# The four report tables as the original loops built them
+def reference_report_tables(filtered_df, start_date, end_date, positive_skip_keywords=positive_skip_keywords,
+                            negative_skip_status=negative_skip_status, rpc_skip_status=rpc_skip_status):
+    client_summary_dfs = {}
+    collector_summary_dfs = {}
+    date_range_str = f"{start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}"
+    valid_df = filtered_df[(filtered_df['Call Duration'].notna()) & 
+                          (filtered_df['Call Duration'] > 0) & 
+                          (filtered_df['Remark By'].str.lower() != "system")]
+    avg_collectors_per_client = valid_df.groupby(['Client', valid_df['Date'].dt.date])['Remark By'].nunique().groupby('Client').mean().apply(lambda x: math.ceil(x) if x % 1 >= 0.5 else round(x))
+
+    overall_client_summary = []
+    for client, client_group in filtered_df.groupby('Client'):
+        total_agents = avg_collectors_per_client.get(client, 0)
+        manual_calls = client_group[client_group['Remark Type'].str.lower() == 'outgoing'].shape[0]
+        manual_accounts = client_group[client_group['Remark Type'].str.lower() == 'outgoing']['Account No.'].nunique()
+        total_connected = client_group[client_group['Call Status'] == 'CONNECTED']['Account No.'].count()
+        total_talk_time_seconds = client_group['Talk Time Duration'].sum()
+        hours, remainder = divmod(int(total_talk_time_seconds), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        formatted_talk_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        positive_skip_count = sum(client_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))
+        negative_skip_count = client_group[client_group['Status'].isin(negative_skip_status)].shape[0]
+        rpc_skip_count = client_group[client_group['Status'].isin(rpc_skip_status)].shape[0]
+        total_skip = positive_skip_count + negative_skip_count + rpc_skip_count
+        positive_skip_connected = client_group[(client_group['Call Status'] == 'CONNECTED') & 
+                                              (client_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Account No.'].count()
+        negative_skip_connected = client_group[(client_group['Call Status'] == 'CONNECTED') & 
+                                              (client_group['Status'].isin(negative_skip_status))]['Account No.'].count()
+        rpc_skip_connected = client_group[(client_group['Call Status'] == 'CONNECTED') & 
+                                        (client_group['Status'].isin(rpc_skip_status))]['Account No.'].count()
+        positive_skip_talk_time_seconds = client_group[(client_group['Call Status'] == 'CONNECTED') & 
+                                                      (client_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Talk Time Duration'].sum()
+        negative_skip_talk_time_seconds = client_group[(client_group['Call Status'] == 'CONNECTED') & 
+                                                      (client_group['Status'].isin(negative_skip_status))]['Talk Time Duration'].sum()
+        rpc_skip_talk_time_seconds = client_group[(client_group['Call Status'] == 'CONNECTED') & 
+                                                (client_group['Status'].isin(rpc_skip_status))]['Talk Time Duration'].sum()
+        pos_hours, pos_remainder = divmod(int(positive_skip_talk_time_seconds), 3600)
+        pos_minutes, pos_seconds = divmod(pos_remainder, 60)
+        positive_skip_talk_time = f"{pos_hours:02d}:{pos_minutes:02d}:{pos_seconds:02d}"
+        neg_hours, neg_remainder = divmod(int(negative_skip_talk_time_seconds), 3600)
+        neg_minutes, neg_seconds = divmod(neg_remainder, 60)
+        negative_skip_talk_time = f"{neg_hours:02d}:{neg_minutes:02d}:{neg_seconds:02d}"
+        rpc_hours, rpc_remainder = divmod(int(rpc_skip_talk_time_seconds), 3600)
+        rpc_minutes, rpc_seconds = divmod(rpc_remainder, 60)
+        rpc_skip_talk_time = f"{rpc_hours:02d}:{rpc_minutes:02d}:{rpc_seconds:02d}"
+        daily_data = client_group.groupby(client_group['Date'].dt.date).agg({
+            'Remark By': lambda x: x[(client_group['Call Duration'].notna()) & 
+                                    (client_group['Call Duration'] > 0) & 
+                                    (client_group['Remark By'].str.lower() != "system")].nunique(),
+            'Account No.': lambda x: x[client_group['Call Status'] == 'CONNECTED'].count(),
+            'Status': [
+                lambda x: sum(x.astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False)),
+                lambda x: x.isin(negative_skip_status).sum(),
+                lambda x: x.isin(rpc_skip_status).sum(),
+                lambda x: x[(client_group['Call Status'] == 'CONNECTED') & 
+                           (x.astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))].count(),
+                lambda x: x[(client_group['Call Status'] == 'CONNECTED') & 
+                           (x.isin(negative_skip_status))].count(),
+                lambda x: x[(client_group['Call Status'] == 'CONNECTED') & 
+                           (x.isin(rpc_skip_status))].count()
+            ],
+            'Talk Time Duration': [
+                'sum',
+                lambda x: x[(client_group['Call Status'] == 'CONNECTED') & 
+                           (client_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))].sum(),
+                lambda x: x[(client_group['Call Status'] == 'CONNECTED') & 
+                           (client_group['Status'].isin(negative_skip_status))].sum(),
+                lambda x: x[(client_group['Call Status'] == 'CONNECTED') & 
+                           (client_group['Status'].isin(rpc_skip_status))].sum()
+            ]
+        })
+        daily_data.columns = ['Collectors', 'Total Connected', 
+                             'Positive Skip', 'Negative Skip', 'RPC Skip',
+                             'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected',
+                             'Talk Time', 'Positive Skip Talk Time Seconds', 'Negative Skip Talk Time Seconds', 'RPC Skip Talk Time Seconds']
+        daily_data['Total Skip'] = daily_data['Positive Skip'] + daily_data['Negative Skip'] + daily_data['RPC Skip']
+        daily_data['Positive Skip Ave'] = daily_data['Positive Skip'] / daily_data['Collectors']
+        daily_data['Negative Skip Ave'] = daily_data['Negative Skip'] / daily_data['Collectors']
+        daily_data['RPC Skip Ave'] = daily_data['RPC Skip'] / daily_data['Collectors']
+        daily_data['Total Skip Ave'] = daily_data['Total Skip'] / daily_data['Collectors']
+        daily_data['Connected Ave'] = daily_data['Total Connected'] / daily_data['Collectors']
+        daily_data['Talk Time Ave Seconds'] = daily_data['Talk Time'] / daily_data['Collectors']
+        positive_skip_ave = round(daily_data['Positive Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        negative_skip_ave = round(daily_data['Negative Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        rpc_skip_ave = round(daily_data['RPC Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        total_skip_ave = round(daily_data['Total Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        connected_ave = round(daily_data['Connected Ave'].mean(), 2) if not daily_data.empty else 0
+        talk_time_ave_seconds = daily_data['Talk Time Ave Seconds'].mean() if not daily_data.empty else 0
+        ave_hours, ave_remainder = divmod(int(talk_time_ave_seconds), 3600)
+        ave_minutes, ave_seconds = divmod(ave_remainder, 60)
+        talk_time_ave_str = f"{ave_hours:02d}:{ave_minutes:02d}:{ave_seconds:02d}"
+        overall_client_summary.append([
+            date_range_str, client, total_agents, manual_calls, manual_accounts, total_connected, positive_skip_count, negative_skip_count, rpc_skip_count, total_skip,
+            positive_skip_connected, negative_skip_connected, rpc_skip_connected,
+            positive_skip_talk_time, negative_skip_talk_time, rpc_skip_talk_time,
+            positive_skip_ave, negative_skip_ave, rpc_skip_ave, total_skip_ave, formatted_talk_time, connected_ave, talk_time_ave_str
+        ])
+    overall_client_summary_df = pd.DataFrame(overall_client_summary, columns=[
+        'Date Range', 'Client', 'Collectors', 'Manual Call', 'Manual Accounts', 'Total Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+        'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected', 
+        'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+        'Positive Skip Ave', 'Negative Skip Ave', 'RPC Skip Ave', 'Total Skip Ave', 'Talk Time (HH:MM:SS)', 'Connected Ave', 'Talk Time Ave'
+    ])
+    overall_collector_summary = []
+    for collector, collector_group in filtered_df.groupby('Remark By'):
+        if collector.lower() == "system":
+            continue
+        client = collector_group['Client'].iloc[0]  # Assuming each collector is tied to one client
+        total_agents = 1  # Since this is per collector, it's always 1
+        manual_calls = collector_group[collector_group['Remark Type'].str.lower() == 'outgoing'].shape[0]
+        manual_accounts = collector_group[collector_group['Remark Type'].str.lower() == 'outgoing']['Account No.'].nunique()
+        total_connected = collector_group[collector_group['Call Status'] == 'CONNECTED']['Account No.'].count()
+        total_talk_time_seconds = collector_group['Talk Time Duration'].sum()
+        hours, remainder = divmod(int(total_talk_time_seconds), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        formatted_talk_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        positive_skip_count = sum(collector_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))
+        negative_skip_count = collector_group[collector_group['Status'].isin(negative_skip_status)].shape[0]
+        rpc_skip_count = collector_group[collector_group['Status'].isin(rpc_skip_status)].shape[0]
+        total_skip = positive_skip_count + negative_skip_count + rpc_skip_count
+        positive_skip_connected = collector_group[(collector_group['Call Status'] == 'CONNECTED') & 
+                                                (collector_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Account No.'].count()
+        negative_skip_connected = collector_group[(collector_group['Call Status'] == 'CONNECTED') & 
+                                                (collector_group['Status'].isin(negative_skip_status))]['Account No.'].count()
+        rpc_skip_connected = collector_group[(collector_group['Call Status'] == 'CONNECTED') & 
+                                          (collector_group['Status'].isin(rpc_skip_status))]['Account No.'].count()
+        positive_skip_talk_time_seconds = collector_group[(collector_group['Call Status'] == 'CONNECTED') & 
+                                                        (collector_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Talk Time Duration'].sum()
+        negative_skip_talk_time_seconds = collector_group[(collector_group['Call Status'] == 'CONNECTED') & 
+                                                        (collector_group['Status'].isin(negative_skip_status))]['Talk Time Duration'].sum()
+        rpc_skip_talk_time_seconds = collector_group[(collector_group['Call Status'] == 'CONNECTED') & 
+                                                  (collector_group['Status'].isin(rpc_skip_status))]['Talk Time Duration'].sum()
+        pos_hours, pos_remainder = divmod(int(positive_skip_talk_time_seconds), 3600)
+        pos_minutes, pos_seconds = divmod(pos_remainder, 60)
+        positive_skip_talk_time = f"{pos_hours:02d}:{pos_minutes:02d}:{pos_seconds:02d}"
+        neg_hours, neg_remainder = divmod(int(negative_skip_talk_time_seconds), 3600)
+        neg_minutes, neg_seconds = divmod(neg_remainder, 60)
+        negative_skip_talk_time = f"{neg_hours:02d}:{neg_minutes:02d}:{neg_seconds:02d}"
+        rpc_hours, rpc_remainder = divmod(int(rpc_skip_talk_time_seconds), 3600)
+        rpc_minutes, rpc_seconds = divmod(rpc_remainder, 60)
+        rpc_skip_talk_time = f"{rpc_hours:02d}:{rpc_minutes:02d}:{rpc_seconds:02d}"
+
+        # Calculate daily averages similar to client summary
+        daily_data = collector_group.groupby(collector_group['Date'].dt.date).agg({
+            'Remark By': lambda x: 1,  # Always 1 for individual collector
+            'Account No.': lambda x: x[collector_group['Call Status'] == 'CONNECTED'].count(),
+            'Status': [
+                lambda x: sum(x.astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False)),
+                lambda x: x.isin(negative_skip_status).sum(),
+                lambda x: x.isin(rpc_skip_status).sum(),
+                lambda x: x[(collector_group['Call Status'] == 'CONNECTED') & 
+                           (x.astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))].count(),
+                lambda x: x[(collector_group['Call Status'] == 'CONNECTED') & 
+                           (x.isin(negative_skip_status))].count(),
+                lambda x: x[(collector_group['Call Status'] == 'CONNECTED') & 
+                           (x.isin(rpc_skip_status))].count()
+            ],
+            'Talk Time Duration': [
+                'sum',
+                lambda x: x[(collector_group['Call Status'] == 'CONNECTED') & 
+                           (collector_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))].sum(),
+                lambda x: x[(collector_group['Call Status'] == 'CONNECTED') & 
+                           (collector_group['Status'].isin(negative_skip_status))].sum(),
+                lambda x: x[(collector_group['Call Status'] == 'CONNECTED') & 
+                           (collector_group['Status'].isin(rpc_skip_status))].sum()
+            ]
+        })
+        daily_data.columns = ['Collectors', 'Total Connected', 
+                             'Positive Skip', 'Negative Skip', 'RPC Skip',
+                             'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected',
+                             'Talk Time', 'Positive Skip Talk Time Seconds', 'Negative Skip Talk Time Seconds', 'RPC Skip Talk Time Seconds']
+        daily_data['Total Skip'] = daily_data['Positive Skip'] + daily_data['Negative Skip'] + daily_data['RPC Skip']
+        daily_data['Positive Skip Ave'] = daily_data['Positive Skip'] / daily_data['Collectors']
+        daily_data['Negative Skip Ave'] = daily_data['Negative Skip'] / daily_data['Collectors']
+        daily_data['RPC Skip Ave'] = daily_data['RPC Skip'] / daily_data['Collectors']
+        daily_data['Total Skip Ave'] = daily_data['Total Skip'] / daily_data['Collectors']
+        daily_data['Connected Ave'] = daily_data['Total Connected'] / daily_data['Collectors']
+        daily_data['Talk Time Ave Seconds'] = daily_data['Talk Time'] / daily_data['Collectors']
+
+        positive_skip_ave = round(daily_data['Positive Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        negative_skip_ave = round(daily_data['Negative Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        rpc_skip_ave = round(daily_data['RPC Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        total_skip_ave = round(daily_data['Total Skip Ave'].mean(), 2) if not daily_data.empty else 0
+        connected_ave = round(daily_data['Connected Ave'].mean(), 2) if not daily_data.empty else 0
+        talk_time_ave_seconds = daily_data['Talk Time Ave Seconds'].mean() if not daily_data.empty else 0
+        ave_hours, ave_remainder = divmod(int(talk_time_ave_seconds), 3600)
+        ave_minutes, ave_seconds = divmod(ave_remainder, 60)
+        talk_time_ave_str = f"{ave_hours:02d}:{ave_minutes:02d}:{ave_seconds:02d}"
+
+        overall_collector_summary.append([
+            date_range_str, collector, total_agents, manual_calls, manual_accounts, total_connected, 
+            positive_skip_count, negative_skip_count, rpc_skip_count, total_skip,
+            positive_skip_connected, negative_skip_connected, rpc_skip_connected,
+            positive_skip_talk_time, negative_skip_talk_time, rpc_skip_talk_time,
+            positive_skip_ave, negative_skip_ave, rpc_skip_ave, total_skip_ave, 
+            formatted_talk_time, connected_ave, talk_time_ave_str
+        ])
+
+    overall_collector_summary_df = pd.DataFrame(overall_collector_summary, columns=[
+        'Date Range', 'Collector', 'Collectors', 'Manual Call', 'Manual Accounts', 'Total Connected', 
+        'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+        'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected', 
+        'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+        'Positive Skip Ave', 'Negative Skip Ave', 'RPC Skip Ave', 'Total Skip Ave', 
+        'Talk Time (HH:MM:SS)', 'Connected Ave', 'Talk Time Ave'
+    ])
+    for client, client_group in filtered_df.groupby('Client'):
+        if True:
+            pass #(f"Client: {client}")
+            summary_table = []
+            for date, date_group in client_group.groupby(client_group['Date'].dt.date):
+                valid_group = date_group[(date_group['Call Duration'].notna()) & 
+                                        (date_group['Call Duration'] > 0) & 
+                                        (date_group['Remark By'].str.lower() != "system")]
+                total_agents = valid_group['Remark By'].nunique()
+                manual_calls = date_group[date_group['Remark Type'].str.lower() == 'outgoing'].shape[0]
+                manual_accounts = date_group[date_group['Remark Type'].str.lower() == 'outgoing']['Account No.'].nunique()
+                total_connected = date_group[date_group['Call Status'] == 'CONNECTED']['Account No.'].count()
+                total_talk_time_seconds = date_group['Talk Time Duration'].sum()
+                hours, remainder = divmod(int(total_talk_time_seconds), 3600)
+                minutes, seconds = divmod(remainder, 60)
+                formatted_talk_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+                talk_time_ave_seconds = total_talk_time_seconds / total_agents if total_agents > 0 else 0
+                ave_hours, ave_remainder = divmod(int(talk_time_ave_seconds), 3600)
+                ave_minutes, ave_seconds = divmod(ave_remainder, 60)
+                talk_time_ave_str = f"{ave_hours:02d}:{ave_minutes:02d}:{ave_seconds:02d}"
+                positive_skip_count = sum(date_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))
+                negative_skip_count = date_group[date_group['Status'].isin(negative_skip_status)].shape[0]
+                rpc_skip_count = date_group[date_group['Status'].isin(rpc_skip_status)].shape[0]
+                total_skip = positive_skip_count + negative_skip_count + rpc_skip_count
+                positive_skip_connected = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                    (date_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Account No.'].count()
+                negative_skip_connected = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                    (date_group['Status'].isin(negative_skip_status))]['Account No.'].count()
+                rpc_skip_connected = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                              (date_group['Status'].isin(rpc_skip_status))]['Account No.'].count()
+                positive_skip_talk_time_seconds = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                            (date_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Talk Time Duration'].sum()
+                negative_skip_talk_time_seconds = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                            (date_group['Status'].isin(negative_skip_status))]['Talk Time Duration'].sum()
+                rpc_skip_talk_time_seconds = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                      (date_group['Status'].isin(rpc_skip_status))]['Talk Time Duration'].sum()
+                pos_hours, pos_remainder = divmod(int(positive_skip_talk_time_seconds), 3600)
+                pos_minutes, pos_seconds = divmod(pos_remainder, 60)
+                positive_skip_talk_time = f"{pos_hours:02d}:{pos_minutes:02d}:{pos_seconds:02d}"
+                neg_hours, neg_remainder = divmod(int(negative_skip_talk_time_seconds), 3600)
+                neg_minutes, neg_seconds = divmod(neg_remainder, 60)
+                negative_skip_talk_time = f"{neg_hours:02d}:{neg_minutes:02d}:{neg_seconds:02d}"
+                rpc_hours, rpc_remainder = divmod(int(rpc_skip_talk_time_seconds), 3600)
+                rpc_minutes, rpc_seconds = divmod(rpc_remainder, 60)
+                rpc_skip_talk_time = f"{rpc_hours:02d}:{rpc_minutes:02d}:{rpc_seconds:02d}"
+                positive_skip_ave = round(positive_skip_count / total_agents, 2) if total_agents > 0 else 0
+                negative_skip_ave = round(negative_skip_count / total_agents, 2) if total_agents > 0 else 0
+                rpc_skip_ave = round(rpc_skip_count / total_agents, 2) if total_agents > 0 else 0
+                total_skip_ave = round(total_skip / total_agents, 2) if total_agents > 0 else 0
+                connected_ave = round(total_connected / total_agents, 2) if total_agents > 0 else 0
+                # Format the date as DD/MM/YYYY
+                formatted_date = date.strftime('%d/%m/%Y')
+                summary_table.append([
+                    formatted_date, total_agents, manual_calls, manual_accounts, total_connected, positive_skip_count, negative_skip_count, rpc_skip_count, total_skip,
+                    positive_skip_connected, negative_skip_connected, rpc_skip_connected, 
+                    positive_skip_talk_time, negative_skip_talk_time, rpc_skip_talk_time,
+                    formatted_talk_time, positive_skip_ave, negative_skip_ave, rpc_skip_ave, total_skip_ave, connected_ave, talk_time_ave_str
+                ])
+            summary_df = pd.DataFrame(summary_table, columns=[
+                'Day', 'Collectors Count', 'Manual Call', 'Manual Accounts', 'Total Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+                'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected', 
+                'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+                'Talk Time (HH:MM:SS)', 'Positive Skip Ave', 'Negative Skip Ave', 'RPC Skip Ave', 'Total Skip Ave', 'Connected Ave', 'Talk Time Ave'
+            ])
+            client_summary_dfs[client] = summary_df
+    for collector, collector_group in filtered_df.groupby('Remark By'):
+        if collector.lower() == "system":
+            continue
+        if True:
+            client = collector_group['Client'].iloc[0]  # Assuming each collector is tied to one client
+            pass #(f"Agent: {collector} (Client: {client})")
+            summary_table = []
+            for date, date_group in collector_group.groupby(collector_group['Date'].dt.date):
+                valid_group = date_group[(date_group['Call Duration'].notna()) & 
+                                        (date_group['Call Duration'] > 0)]
+                collectors = collector  # Single collector name
+                manual_calls = date_group[date_group['Remark Type'].str.lower() == 'outgoing'].shape[0]
+                manual_accounts = date_group[date_group['Remark Type'].str.lower() == 'outgoing']['Account No.'].nunique()
+                total_connected = date_group[date_group['Call Status'] == 'CONNECTED']['Account No.'].count()
+                total_talk_time_seconds = date_group['Talk Time Duration'].sum()
+                hours, remainder = divmod(int(total_talk_time_seconds), 3600)
+                minutes, seconds = divmod(remainder, 60)
+                formatted_talk_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+                positive_skip_count = sum(date_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))
+                negative_skip_count = date_group[date_group['Status'].isin(negative_skip_status)].shape[0]
+                rpc_skip_count = date_group[date_group['Status'].isin(rpc_skip_status)].shape[0]
+                total_skip = positive_skip_count + negative_skip_count + rpc_skip_count
+                positive_skip_connected = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                    (date_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Account No.'].count()
+                negative_skip_connected = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                    (date_group['Status'].isin(negative_skip_status))]['Account No.'].count()
+                rpc_skip_connected = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                              (date_group['Status'].isin(rpc_skip_status))]['Account No.'].count()
+                positive_skip_talk_time_seconds = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                            (date_group['Status'].astype(str).str.contains('|'.join(positive_skip_keywords), case=False, na=False))]['Talk Time Duration'].sum()
+                negative_skip_talk_time_seconds = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                            (date_group['Status'].isin(negative_skip_status))]['Talk Time Duration'].sum()
+                rpc_skip_talk_time_seconds = date_group[(date_group['Call Status'] == 'CONNECTED') & 
+                                                      (date_group['Status'].isin(rpc_skip_status))]['Talk Time Duration'].sum()
+                pos_hours, pos_remainder = divmod(int(positive_skip_talk_time_seconds), 3600)
+                pos_minutes, pos_seconds = divmod(pos_remainder, 60)
+                positive_skip_talk_time = f"{pos_hours:02d}:{pos_minutes:02d}:{pos_seconds:02d}"
+                neg_hours, neg_remainder = divmod(int(negative_skip_talk_time_seconds), 3600)
+                neg_minutes, neg_seconds = divmod(neg_remainder, 60)
+                negative_skip_talk_time = f"{neg_hours:02d}:{neg_minutes:02d}:{neg_seconds:02d}"
+                rpc_hours, rpc_remainder = divmod(int(rpc_skip_talk_time_seconds), 3600)
+                rpc_minutes, rpc_seconds = divmod(rpc_remainder, 60)
+                rpc_skip_talk_time = f"{rpc_hours:02d}:{rpc_minutes:02d}:{rpc_seconds:02d}"
+                # Format the date as DD/MM/YYYY
+                formatted_date = date.strftime('%d/%m/%Y')
+                summary_table.append([
+                    formatted_date, collectors, client, manual_calls, manual_accounts, total_connected, positive_skip_count, negative_skip_count, rpc_skip_count, total_skip,
+                    positive_skip_connected, negative_skip_connected, rpc_skip_connected, 
+                    positive_skip_talk_time, negative_skip_talk_time, rpc_skip_talk_time,
+                    formatted_talk_time
+                ])
+            summary_df = pd.DataFrame(summary_table, columns=[
+                'Day', 'Collector', 'Client', 'Manual Call', 'Manual Accounts', 'Total Connected', 'Positive Skip', 'Negative Skip', 'RPC Skip', 'Total Skip',
+                'Positive Skip Connected', 'Negative Skip Connected', 'RPC Skip Connected', 
+                'Positive Skip Talk Time', 'Negative Skip Talk Time', 'RPC Skip Talk Time',
+                'Talk Time (HH:MM:SS)'
+            ])
+            collector_summary_dfs[collector] = summary_df
+    return overall_client_summary_df, overall_collector_summary_df, client_summary_dfs, collector_summary_dfs
@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+
+# Seconds a dataset no session holds stays in memory, so a re-upload or another supervisor opening
+# the same file reuses it
+IDLE_SECONDS = float(os.environ.get('MC06_REGISTRY_IDLE_SECONDS', '600'))
+
+# Process-wide registry of loaded datasets, keyed by content hash: one shared copy per file,
+# referenced by the sessions that have it open
+_datasets = {}
+_session_keys = {}
+_registry_lock = threading.Lock()
+_load_locks = {}
+
+
+def _release(session_id):
+    key = _session_keys.pop(session_id, None)
+    if key in _datasets:
+        entry = _datasets[key]
+        entry['sessions'].discard(session_id)
+        entry['last_used'] = time.monotonic()
+
+
+# Drop references of sessions that have ended, then datasets nobody has held for IDLE_SECONDS.
+# Must be called with the registry lock held.
+def _evict(is_active):
+    if is_active is not None:
+        for session_id in [session_id for session_id in _session_keys if not is_active(session_id)]:
+            _release(session_id)
+    now = time.monotonic()
+    for key in [key for key, entry in _datasets.items() if not entry['sessions'] and now - entry['last_used'] >= IDLE_SECONDS]:
+        del _datasets[key]
+
+
+# Return the shared frame of dataset key for a session, loading it with load() on first use.
+# A session holds one dataset at a time: acquiring a new one releases the previous one.
+# The frame is shared by every session that has the same file open, so it must be treated as read-only.
+# is_active(session_id), when given, tells whether a session is still connected.
+def acquire_dataset(key, session_id, load, is_active=None):
+    with _registry_lock:
+        _evict(is_active)
+        if _session_keys.get(session_id) != key:
+            _release(session_id)
+        entry = _datasets.get(key)
+        if entry is not None:
+            entry['sessions'].add(session_id)
+            _session_keys[session_id] = key
+            return entry['df']
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    # Load outside the registry lock; sessions asking for the same new file wait for one load
+    with load_lock:
+        with _registry_lock:
+            entry = _datasets.get(key)
+        if entry is None:
+            entry = {'df': load(), 'sessions': set(), 'last_used': time.monotonic()}
+        with _registry_lock:
+            entry = _datasets.setdefault(key, entry)
+            entry['sessions'].add(session_id)
+            _session_keys[session_id] = key
+            _load_locks.pop(key, None)
+            return entry['df']
+
+
+# Release whatever dataset a session holds, e.g. when its upload was removed
+def release_session(session_id, is_active=None):
+    with _registry_lock:
+        _release(session_id)
+        _evict(is_active)
+
+
+# Number of sessions holding each registered dataset
+def registry_snapshot():
+    with _registry_lock:
+        return {key: len(entry['sessions']) for key, entry in _datasets.items()}
@@ -0,0 +1,218 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+
+import pandas as pd
+
+from cache import load_cached_frame
+from classifier import skip_taxonomy
+from ingest import classify_remarks
+from metrics import GROUP_KEYS, HOURLY_KEYS, HOURLY_SUM_COLUMNS, SUM_COLUMNS, aggregate_hourly, aggregate_remarks
+from profiling import stage
+
+# Location of the persistent daily store: one day=YYYY-MM-DD partition per remark day, holding the
+# source=<content hash> part of the file that stored it last, plus a manifest
+STORE_DIR = os.environ.get('MC06_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mc06_store'))
+MANIFEST_FILE = 'manifest.json'
+AGGREGATES_FILE = 'aggregates.parquet'
+ACCOUNTS_FILE = 'accounts.parquet'
+HOURLY_FILE = 'hourly.parquet'
+
+_ingest_lock = threading.Lock()
+
+
+def _partition_dir(store_dir, day):
+    return os.path.join(store_dir, f"day={day:%Y-%m-%d}")
+
+
+def _source_dir(store_dir, day, key):
+    return os.path.join(_partition_dir(store_dir, day), f"source={key}")
+
+
+# Directories holding the parts of one stored day, one per source file, leaving out the excluded sources
+def _day_parts(partition, exclude=()):
+    if not os.path.isdir(partition):
+        return []
+    return [
+        os.path.join(partition, name) for name in sorted(os.listdir(partition))
+        if name.startswith('source=') and name[len('source='):] not in exclude
+        and os.path.exists(os.path.join(partition, name, AGGREGATES_FILE))
+    ]
+
+
+# Write to a temporary file first so readers never see a half-written file
+def replace_file(path, write):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_manifest(store_dir):
+    try:
+        with open(os.path.join(store_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'sources': {}, 'next_row': 0}
+
+
+def _write_manifest(store_dir, manifest):
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    replace_file(os.path.join(store_dir, MANIFEST_FILE), write)
+
+
+# Add one cleaned Daily Remark frame, classified with taxonomy (the current one by default), to the store,
+# keyed by its upload content hash. Of two files with remarks on the same day, the one ingested later holds
+# that day (a later export of the day, or a month-to-date file after the daily ones): its part replaces the
+# earlier file's, which is recorded under the later file's 'replaced' days, and a file ingested again never
+# writes the days a later file holds. A file that was already ingested with the same taxonomy is skipped.
+# Returns the days that were written.
+def ingest_frame(key, df, store_dir=STORE_DIR, taxonomy=None):
+    taxonomy = taxonomy or skip_taxonomy()
+    with _ingest_lock, stage('store ingest', rows=len(df)):
+        manifest = _read_manifest(store_dir)
+        source = manifest['sources'].get(key, {})
+        if source.get('taxonomy') == taxonomy['version']:
+            return []
+        # Row positions continue across files, so "first remark" means first in ingest order; a file ingested
+        # again (e.g. under a new taxonomy) keeps the positions of its first ingest
+        first_row = source.get('first_row')
+        if first_row is None:
+            first_row = manifest['next_row']
+            manifest['next_row'] += len(df)
+        others = {other_key: other for other_key, other in manifest['sources'].items() if other_key != key}
+        later_days = {
+            day for other in others.values() if other.get('first_row', -1) > first_row for day in other['days']
+        }
+        day_aggregates, outgoing_accounts = aggregate_remarks(df, first_row=first_row)
+        accounts_by_day = dict(list(outgoing_accounts.groupby('day')))
+        hourly = aggregate_hourly(df)
+        hourly_by_day = dict(list(hourly.groupby('day')))
+        days = []
+        replaced = set(source.get('replaced', []))
+        for day, aggregates in day_aggregates.groupby('day'):
+            if day.date().isoformat() in later_days:
+                continue
+            for other_key, other in others.items():
+                if day.date().isoformat() in other['days']:
+                    shutil.rmtree(_source_dir(store_dir, day, other_key), ignore_errors=True)
+                    other['days'].remove(day.date().isoformat())
+                    replaced.add(day.date().isoformat())
+            partition = _source_dir(store_dir, day, key)
+            os.makedirs(partition, exist_ok=True)
+            accounts = accounts_by_day.get(day, outgoing_accounts.iloc[:0])
+            replace_file(os.path.join(partition, AGGREGATES_FILE), aggregates.reset_index(drop=True).to_parquet)
+            replace_file(os.path.join(partition, ACCOUNTS_FILE), accounts.reset_index(drop=True).to_parquet)
+            day_hourly = hourly_by_day.get(day, hourly.iloc[:0])
+            replace_file(os.path.join(partition, HOURLY_FILE), day_hourly.reset_index(drop=True).to_parquet)
+            days.append(day.date())
+        manifest['sources'][key] = {
+            'days': [day.isoformat() for day in days],
+            'replaced': sorted(replaced),
+            'rows': len(df),
+            'taxonomy': taxonomy['version'],
+            'first_row': first_row,
+            'ingested_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+        _write_manifest(store_dir, manifest)
+        return days
+
+
+# Days of the file with this content hash whose remarks replaced those an earlier file had stored
+def replaced_days(key, store_dir=STORE_DIR):
+    return _read_manifest(store_dir)['sources'].get(key, {}).get('replaced', [])
+
+
+# Whether the file with this content hash was already ingested with this taxonomy version
+def has_source(key, taxonomy_version, store_dir=STORE_DIR):
+    return _read_manifest(store_dir)['sources'].get(key, {}).get('taxonomy') == taxonomy_version
+
+
+# Bring every stored file up to the taxonomy: a file ingested with another one is classified again from its
+# cleaned frame in the Parquet cache and re-ingested. Returns the content hashes of the files that are no longer
+# cached and so stay classified with an older taxonomy; their parts are left out of the reports.
+def refresh_sources(taxonomy, store_dir=STORE_DIR):
+    stale = []
+    for key, source in _read_manifest(store_dir)['sources'].items():
+        if source.get('taxonomy') == taxonomy['version']:
+            continue
+        df = load_cached_frame(key)
+        if df is None:
+            stale.append(key)
+            continue
+        ingest_frame(key, classify_remarks(df, taxonomy), store_dir, taxonomy)
+    return stale
+
+
+# Days that have a partition in the store, in order, leaving out days only the excluded sources have
+def stored_days(store_dir=STORE_DIR, exclude=()):
+    if not os.path.isdir(store_dir):
+        return []
+    days = []
+    for name in os.listdir(store_dir):
+        if name.startswith('day=') and _day_parts(os.path.join(store_dir, name), exclude):
+            days.append(datetime.date.fromisoformat(name[len('day='):]))
+    return sorted(days)
+
+
+# Fingerprint of the store contents, for cache keys: it changes whenever a file is ingested or reclassified
+def store_version(store_dir=STORE_DIR):
+    manifest = _read_manifest(store_dir)
+    sources = sorted((key, source.get('taxonomy')) for key, source in manifest['sources'].items())
+    return hashlib.sha256(json.dumps(sources).encode()).hexdigest()
+
+
+# Empty pre-aggregated parts, for a date range without stored days
+def _empty_aggregates():
+    day_aggregates = pd.DataFrame({
+        'day': pd.Series(dtype='datetime64[ns]'), 'Client': pd.Series(dtype=object), 'Remark By': pd.Series(dtype=object),
+        'first_row': pd.Series(dtype='int64'), **{column: pd.Series(dtype='int64') for column in SUM_COLUMNS},
+    })
+    return day_aggregates, day_aggregates[GROUP_KEYS].assign(**{'Account No.': pd.Series(dtype=object)})
+
+
+# Pre-aggregated parts of every stored day between start_date and end_date (inclusive),
+# ready for metrics.report_tables_from_aggregates, leaving out the excluded sources. A range in a gap between
+# stored days gives empty parts.
+def load_aggregates(start_date, end_date, store_dir=STORE_DIR, exclude=()):
+    with stage('store load') as counts:
+        aggregates = []
+        accounts = []
+        for day in stored_days(store_dir, exclude):
+            if start_date <= day <= end_date:
+                for part in _day_parts(_partition_dir(store_dir, day), exclude):
+                    aggregates.append(pd.read_parquet(os.path.join(part, AGGREGATES_FILE)))
+                    accounts.append(pd.read_parquet(os.path.join(part, ACCOUNTS_FILE)))
+        if not aggregates:
+            return _empty_aggregates()
+        day_aggregates = pd.concat(aggregates, ignore_index=True)
+        counts['rows'] = len(day_aggregates)
+        return day_aggregates, pd.concat(accounts, ignore_index=True)
+
+
+# Hourly aggregates of every stored day between start_date and end_date (inclusive), ready for
+# metrics.hourly_collector_table, leaving out the excluded sources. Days stored before the hourly breakdown
+# existed have none.
+def load_hourly(start_date, end_date, store_dir=STORE_DIR, exclude=()):
+    with stage('store load hourly') as counts:
+        hourly = []
+        for day in stored_days(store_dir, exclude):
+            if start_date <= day <= end_date:
+                for part in _day_parts(_partition_dir(store_dir, day), exclude):
+                    path = os.path.join(part, HOURLY_FILE)
+                    if os.path.exists(path):
+                        hourly.append(pd.read_parquet(path))
+        if not hourly:
+            return pd.DataFrame(columns=HOURLY_KEYS + HOURLY_SUM_COLUMNS)
+        hourly = pd.concat(hourly, ignore_index=True)
+        counts['rows'] = len(hourly)
+        return hourly
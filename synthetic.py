@@ -0,0 +1,108 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from classifier import negative_skip_status, positive_skip_keywords, rpc_skip_status
+from ingest import REQUIRED_COLUMNS
+
+# Statuses that match none of the skip lists, so the skip rates stay realistic
+OTHER_STATUSES = ['PTP', 'PTP - FOLLOW UP', 'NO ANSWER', 'BUSY', 'CALLBACK', 'FIELD VISIT', 'PAID', 'DISPUTE']
+CALL_STATUSES = ['CONNECTED', 'NO ANSWER', 'BUSY', 'DROPPED', None]
+REMARK_TYPES = ['Outgoing', 'Predictive', 'Follow Up', 'Incoming']
+REMARKS = ['Called the account holder', 'Left a message', 'Broken Promise - no payment received', 'Sent SMS', None]
+# Largest number of data rows a single xlsx sheet can hold
+XLSX_MAX_ROWS = 1048575
+
+
+# Generate a raw Daily Remark frame, as read from the workbook, with the columns the app reads.
+# Every collector works for one client, apart from a small share of remarks on other clients;
+# a "system" user adds automated remarks. missing_rate blanks that share of the key, status and account cells.
+# The same seed always gives the same frame.
+def generate_remarks(rows, clients=10, collectors=100, days=22, start_date='2025-01-01', seed=0, missing_rate=0.0):
+    rng = np.random.default_rng(seed)
+    client_names = np.array([f"CLIENT {idx + 1:03d}" for idx in range(clients)], dtype=object)
+    collector_names = np.array([f"AGENT {idx + 1:04d}" for idx in range(collectors)] + ["SYSTEM"], dtype=object)
+    collector_clients = np.arange(collectors + 1) % clients
+
+    collector_idx = rng.integers(0, collectors + 1, rows)
+    client_idx = collector_clients[collector_idx]
+    cross_client = rng.random(rows) < 0.02
+    client_idx[cross_client] = rng.integers(0, clients, cross_client.sum())
+
+    # About one remark in five carries a skip status
+    statuses = np.array(positive_skip_keywords + negative_skip_status + rpc_skip_status + OTHER_STATUSES, dtype=object)
+    skip_count = len(statuses) - len(OTHER_STATUSES)
+    is_skip = rng.random(rows) < 0.2
+    status_idx = np.where(is_skip, rng.integers(0, skip_count, rows), rng.integers(skip_count, len(statuses), rows))
+
+    # Remarks fall in working hours; times are written as HH:MM:SS text
+    seconds_of_day = rng.integers(7 * 3600, 20 * 3600, rows)
+    hms = np.array([f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in range(86400)], dtype=object)
+
+    call_status = np.array(CALL_STATUSES, dtype=object)[rng.choice(len(CALL_STATUSES), rows, p=[0.45, 0.25, 0.15, 0.05, 0.1])]
+    connected = call_status == 'CONNECTED'
+    call_duration = np.where(pd.isna(call_status), np.nan, rng.integers(5, 900, rows) * (rng.random(rows) < 0.9))
+    talk_time = np.where(connected, np.minimum(call_duration, rng.integers(10, 600, rows)), 0)
+
+    df = pd.DataFrame({
+        'Client': client_names[client_idx],
+        'Remark By': collector_names[collector_idx],
+        'Date': pd.Timestamp(start_date) + pd.to_timedelta(rng.integers(0, days, rows), unit='D'),
+        'Time': hms[seconds_of_day],
+        'Status': statuses[status_idx],
+        'Call Status': call_status,
+        'Remark Type': np.array(REMARK_TYPES, dtype=object)[rng.choice(len(REMARK_TYPES), rows, p=[0.6, 0.2, 0.15, 0.05])],
+        'Account No.': rng.integers(10 ** 9, 10 ** 9 + max(rows // 4, 1), rows),
+        'Talk Time Duration': talk_time,
+        'Call Duration': call_duration,
+        'Remark': np.array(REMARKS, dtype=object)[rng.choice(len(REMARKS), rows, p=[0.5, 0.2, 0.05, 0.15, 0.1])],
+    }, columns=REQUIRED_COLUMNS)
+    if missing_rate:
+        for column in ['Client', 'Remark By', 'Status', 'Account No.']:
+            df[column] = df[column].mask(rng.random(rows) < missing_rate)
+    return df
+
+
+# Write a raw remark frame as a Daily Remark workbook, with the real export's date cells
+def write_remarks_xlsx(df, path):
+    if len(df) > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(df)} rows do not fit in one xlsx sheet (at most {XLSX_MAX_ROWS})")
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'nan_inf_to_errors': False})
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+    worksheet = workbook.add_worksheet('Daily Remark')
+    worksheet.write_row(0, 0, list(df.columns))
+    date_column = list(df.columns).index('Date')
+    rows = df.astype(object).where(df.notna(), None).to_numpy().tolist()
+    for row_idx, row in enumerate(rows, start=1):
+        for col_idx, value in enumerate(row):
+            if value is None:
+                continue
+            if col_idx == date_column:
+                worksheet.write_datetime(row_idx, col_idx, value.to_pydatetime(), date_format)
+            else:
+                worksheet.write(row_idx, col_idx, value)
+    workbook.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Daily Remark workbook.")
+    parser.add_argument('output', help="path of the .xlsx file to write")
+    parser.add_argument('--rows', type=int, default=100000, help="number of remark rows")
+    parser.add_argument('--clients', type=int, default=10, help="number of clients")
+    parser.add_argument('--collectors', type=int, default=100, help="number of collectors")
+    parser.add_argument('--days', type=int, default=22, help="number of remark days")
+    parser.add_argument('--start', default='2025-01-01', help="first remark day (YYYY-MM-DD)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    df = generate_remarks(args.rows, args.clients, args.collectors, args.days, args.start, args.seed)
+    write_remarks_xlsx(df, args.output)
+    print(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,305 @@
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from cache import cached_report_tables, content_hash
+from classifier import TAXONOMY_PATH, skip_taxonomy
+from export import WORKBOOKS, create_combined_excel_file
+from ingest import load_remarks
+from metrics import hourly_collector_table, report_tables_from_aggregates
+from parallel import mp_context
+from store import (
+    STORE_DIR, has_source, ingest_frame, load_aggregates, load_hourly, refresh_sources, replace_file, replaced_days, store_version,
+    stored_days
+)
+
+# Directory watched for new Daily Remark files; unset leaves the watcher off
+WATCH_DIR = os.environ.get('MC06_WATCH_DIR')
+# Worker processes parsing watched files, so parsing never runs on a page's thread
+WATCH_JOBS = int(os.environ.get('MC06_WATCH_JOBS', '1'))
+# A file is picked up once it has not changed for this long, so half-copied files are not parsed
+SETTLE_SECONDS = float(os.environ.get('MC06_WATCH_SETTLE_SECONDS', '2'))
+# How often open pages check whether the watcher refreshed the reports
+REFRESH_SECONDS = float(os.environ.get('MC06_WATCH_REFRESH_SECONDS', '5'))
+
+_watcher = None
+_watcher_lock = threading.Lock()
+_pending = {}
+_pending_lock = threading.Lock()
+_wake = threading.Event()
+_status = {'ingested': 0, 'last_file': None, 'last_ingested_at': None, 'last_replaced': [], 'refreshes': 0, 'errors': {}}
+_workbooks = {}
+_status_lock = threading.Lock()
+
+
+# Daily Remark workbooks, leaving out Excel's ~$ lock files and hidden files
+def is_remark_file(path):
+    name = os.path.basename(path)
+    return name.lower().endswith('.xlsx') and not name.startswith(('~$', '.'))
+
+
+# Note a new or changed file; it is ingested once it has settled
+def _queue_file(path):
+    if not is_remark_file(path):
+        return
+    with _pending_lock:
+        _pending[path] = time.monotonic()
+    _wake.set()
+
+
+class _RemarkFileHandler(FileSystemEventHandler):
+    def on_created(self, event):
+        if not event.is_directory:
+            _queue_file(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            _queue_file(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            _queue_file(event.dest_path)
+
+
+# Queue every file already in the directory; they are complete, so they need not wait to settle
+def _queue_directory(watch_dir, settle_seconds):
+    for name in os.listdir(watch_dir):
+        _queue_file(os.path.join(watch_dir, name))
+    with _pending_lock:
+        for path in _pending:
+            _pending[path] -= settle_seconds
+
+
+def _settled_files(settle_seconds):
+    now = time.monotonic()
+    with _pending_lock:
+        paths = [path for path, changed in _pending.items() if now - changed >= settle_seconds]
+        for path in paths:
+            del _pending[path]
+    return paths
+
+
+def _record_error(path, error):
+    with _status_lock:
+        _status['errors'][path] = f"{type(error).__name__}: {error}"
+
+
+# Parse the settled files in the worker processes, classify them with taxonomy and add them to the store in
+# modification order, skipping files whose content was already ingested with it. Returns the number of files ingested.
+def _ingest_files(paths, executor, store_dir, taxonomy):
+    jobs = []
+    for path in sorted(paths, key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            _record_error(path, e)
+            continue
+        key = content_hash(data)
+        if has_source(key, taxonomy['version'], store_dir):
+            continue
+        jobs.append((path, key, executor.submit(load_remarks, data, key, taxonomy)))
+
+    ingested = 0
+    for path, key, future in jobs:
+        try:
+            _, df = future.result()
+            ingest_frame(key, df, store_dir, taxonomy)
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            # An unreadable file is reported and retried when it changes again
+            _record_error(path, e)
+            continue
+        ingested += 1
+        with _status_lock:
+            _status['errors'].pop(path, None)
+            _status['ingested'] += 1
+            _status['last_file'] = os.path.basename(path)
+            _status['last_ingested_at'] = datetime.datetime.now().isoformat(timespec='seconds')
+            _status['last_replaced'] = replaced_days(key, store_dir)
+    return ingested
+
+
+def _write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+# Build the report tables and both workbooks for every stored day, under the same keys the dashboard uses,
+# so a page showing the whole stored range gets them without waiting. Stored files are first brought up to the
+# taxonomy like on the dashboard. Workbooks are also written to output_dir when one is given.
+def prerender_reports(store_dir=STORE_DIR, output_dir=None, taxonomy=None):
+    taxonomy = taxonomy or skip_taxonomy()
+    stale_sources = refresh_sources(taxonomy, store_dir)
+    days = stored_days(store_dir, stale_sources)
+    if not days:
+        return
+    start_date, end_date = days[0], days[-1]
+    dataset_key = store_version(store_dir)
+    overall_client_summary_df, overall_collector_summary_df, _, _ = cached_report_tables(
+        (dataset_key, start_date, end_date, taxonomy['version']),
+        lambda: report_tables_from_aggregates(
+            *load_aggregates(start_date, end_date, store_dir, stale_sources), start_date, end_date
+        )
+    )
+    hourly_df = cached_report_tables(
+        (dataset_key, start_date, end_date, taxonomy['version'], 'hourly'),
+        lambda: hourly_collector_table(load_hourly(start_date, end_date, store_dir, stale_sources))
+    )
+    overall_summaries = {'client': overall_client_summary_df, 'collector': overall_collector_summary_df}
+    hourly_dfs = {'client': None, 'collector': hourly_df}
+    workbooks = {}
+    for report_type, (sheet_prefix, main_header_text, file_name) in WORKBOOKS.items():
+        workbook = create_combined_excel_file(
+            {}, overall_summaries[report_type], sheet_prefix, main_header_text, hourly_dfs[report_type]
+        )
+        workbooks[(dataset_key, taxonomy['version'], start_date, end_date, report_type)] = workbook
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            replace_file(os.path.join(output_dir, file_name), lambda path: _write_bytes(path, workbook))
+
+    # Workbooks of older store versions are stale, so only the latest set is kept
+    with _status_lock:
+        _workbooks.clear()
+        _workbooks.update(workbooks)
+        _status['refreshes'] += 1
+
+
+# The current skip taxonomy; a broken edit of the taxonomy file is reported and the last good one kept
+def _current_taxonomy(taxonomy):
+    try:
+        current = skip_taxonomy()
+    except (OSError, ValueError) as e:
+        _record_error(TAXONOMY_PATH, e)
+        return taxonomy
+    with _status_lock:
+        _status['errors'].pop(TAXONOMY_PATH, None)
+    return current
+
+
+def _run(watch_dir, store_dir, jobs, settle_seconds, output_dir, stop):
+    executor = ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context())
+    taxonomy = None
+    try:
+        while not stop.is_set():
+            current = _current_taxonomy(taxonomy)
+            if current is not None and (taxonomy is None or current['version'] != taxonomy['version']):
+                # Every watched file is ingested again under a changed taxonomy, so the stored days follow it
+                if taxonomy is not None:
+                    _queue_directory(watch_dir, settle_seconds)
+                taxonomy = current
+                # Reports of what is already stored are ready before the first new file arrives
+                try:
+                    prerender_reports(store_dir, output_dir, taxonomy)
+                except Exception as e:
+                    _record_error(watch_dir, e)
+            _wake.wait(settle_seconds)
+            _wake.clear()
+            paths = _settled_files(settle_seconds) if taxonomy is not None else []
+            if not paths:
+                continue
+            try:
+                ingested = _ingest_files(paths, executor, store_dir, taxonomy)
+            except BrokenProcessPool:
+                # A worker died; queue the files again on a fresh pool
+                executor = ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context())
+                for path in paths:
+                    _queue_file(path)
+                continue
+            if ingested:
+                try:
+                    prerender_reports(store_dir, output_dir, taxonomy)
+                except Exception as e:
+                    _record_error(watch_dir, e)
+    finally:
+        executor.shutdown(wait=False)
+
+
+# Start the process-wide ingestion service on watch_dir, unless it is already running.
+# Files already in the directory are ingested first, then every new or replaced .xlsx file.
+def start_watcher(watch_dir, store_dir=STORE_DIR, jobs=WATCH_JOBS, settle_seconds=SETTLE_SECONDS, output_dir=None):
+    global _watcher
+    with _watcher_lock:
+        if _watcher is not None:
+            return _watcher
+        os.makedirs(watch_dir, exist_ok=True)
+        stop = threading.Event()
+        observer = Observer()
+        observer.schedule(_RemarkFileHandler(), watch_dir)
+        observer.daemon = True
+        observer.start()
+        _queue_directory(watch_dir, settle_seconds)
+        thread = threading.Thread(
+            target=_run, args=(watch_dir, store_dir, jobs, settle_seconds, output_dir, stop),
+            name='mc06-watcher', daemon=True
+        )
+        thread.start()
+        _watcher = {'dir': watch_dir, 'observer': observer, 'thread': thread, 'stop': stop}
+        return _watcher
+
+
+def stop_watcher():
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            return
+        _watcher['observer'].stop()
+        _watcher['stop'].set()
+        _wake.set()
+        _watcher['observer'].join()
+        _watcher['thread'].join()
+        _watcher = None
+
+
+# Workbook pre-rendered for (dataset key, taxonomy version, start date, end date, report type), or None
+def prerendered_workbook(key):
+    with _status_lock:
+        return _workbooks.get(key)
+
+
+# Files ingested so far, the last one and the days it replaced, the number of report refreshes and the files that failed
+def watcher_status():
+    with _status_lock:
+        return dict(_status, errors=dict(_status['errors']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest Daily Remark files dropped into a directory into the MC06 daily store.")
+    parser.add_argument('watch_dir', nargs='?', default=WATCH_DIR, help="directory to watch (default: $MC06_WATCH_DIR)")
+    parser.add_argument('-o', '--output-dir', help="directory where the month-to-date workbooks are kept up to date")
+    parser.add_argument('-j', '--jobs', type=int, default=WATCH_JOBS, help="number of files parsed in parallel")
+    args = parser.parse_args(argv)
+    if args.watch_dir is None:
+        parser.error("no directory to watch")
+
+    start_watcher(args.watch_dir, jobs=args.jobs, output_dir=args.output_dir)
+    reported = watcher_status()
+    try:
+        while True:
+            time.sleep(1)
+            status = watcher_status()
+            if status['ingested'] != reported['ingested']:
+                replaced = f", replaced earlier files' remarks for {', '.join(status['last_replaced'])}" if status['last_replaced'] else ""
+                print(f"{status['last_ingested_at']}  {status['last_file']}  ({status['ingested']} files ingested{replaced})")
+            for path, error in status['errors'].items():
+                if reported['errors'].get(path) != error:
+                    print(f"{path}: {error}", file=sys.stderr)
+            reported = status
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_watcher()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())